@@ -19,16 +19,19 @@ setup(
     install_requires=[
         "click>=8.0.0",
         "rich>=10.0.0",
-        "llama-index>=0.7.0",
         "pydantic>=2.0.0",
-        "openai>=1.0.0",
+        "openai>=1.17.0",
         "python-dotenv>=0.19.0",
         "pyyaml>=6.0",
         "python-docx>=0.8.11",
         "PyPDF2>=3.0.0",
+        "pypdfium2>=4.0.0",
         "python-magic>=0.4.24",
         "tqdm>=4.64.0",
     ],
+    extras_require={
+        "speedups": ["orjson>=3.9.0"],
+    },
     entry_points={
         "console_scripts": [
             "llm-organizer=llm_organizer.__main__:main",
@@ -6,12 +6,8 @@ import sys
 import click
 from rich.console import Console
 
-from llm_organizer.cli.commands import (
-    migrate_command,
-    organize_command,
-    test_api_command,
-    undo_command,
-)
+# Command implementations are imported inside each command so that --help and
+# light commands don't pay for loading the scanner, indexer and API clients.
 
 console = Console()
 
@@ -26,7 +22,7 @@ def cli():
 
 
 @cli.command()
-@click.argument("directory", type=click.Path(exists=True))
+@click.argument("directories", nargs=-1, required=True, type=click.Path(exists=True))
 @click.option(
     "--recursive/--no-recursive", default=True, help="Scan directories recursively"
 )
@@ -51,22 +47,33 @@ def cli():
     default=False,
     help="Use intelligent organization based on all files together",
 )
+@click.option(
+    "--batch/--no-batch",
+    default=None,
+    help="Analyze files through the OpenAI Batch API (cheaper, may take hours)",
+)
 @click.option(
     "--config", "-c", type=click.Path(exists=True), help="Path to configuration file"
 )
 def organize(
-    directory,
+    directories,
     recursive,
     preview,
     exclude,
     exclude_file,
     open_report,
     intelligent,
+    batch,
     config=None,
 ):
-    """Organize files in DIRECTORY using AI."""
+    """Organize files in DIRECTORIES using AI.
+
+    The organization plans of several directories are requested concurrently.
+    """
+    from llm_organizer.cli.commands import organize_command
+
     organize_command(
-        directory,
+        list(directories),
         recursive,
         preview,
         exclude,
@@ -74,18 +81,23 @@ def organize(
         open_report,
         intelligent,
         config,
+        batch,
     )
 
 
 @cli.command()
 def undo():
     """Undo the last organization operation."""
+    from llm_organizer.cli.commands import undo_command
+
     undo_command()
 
 
 @cli.command()
 def test_api():
     """Test the connection to the OpenAI API."""
+    from llm_organizer.cli.commands import test_api_command
+
     test_api_command()
 
 
@@ -93,6 +105,8 @@ def test_api():
 @click.argument("directory", type=click.Path(exists=True))
 def migrate(directory):
     """Migrate organizer files in DIRECTORY to hidden folder."""
+    from llm_organizer.cli.commands import migrate_command
+
     migrate_command(directory)
 
 
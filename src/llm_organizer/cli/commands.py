@@ -1,38 +1,268 @@
 """Implementation of CLI commands."""
 
+import asyncio
+import hashlib
+import json
 import os
-import webbrowser
+import queue
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
-from typing import List, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple, Union
 
-import yaml
 from rich.console import Console
 from rich.prompt import Confirm
 
 from llm_organizer.config.schema import AppConfig
-from llm_organizer.core.indexer import FileIndexer
 from llm_organizer.core.organizer import FileOrganizer
-from llm_organizer.core.scanner import DirectoryScanner
+from llm_organizer.models.file_metadata import (
+    MetadataStore,
+    analysis_row,
+    metadata_row,
+)
 from llm_organizer.utils.logger import OperationLogger
 
-console = Console()
+# The scanner, indexer (with the OpenAI SDK), YAML parser and browser modules
+# are imported by the commands using them, so undo and migrate start quickly
+if TYPE_CHECKING:
+    from llm_organizer.core.indexer import FileIndexer
 
+# Status lines carry their own styles, so Rich's automatic highlighting of
+# numbers, paths and URLs in every printed line is skipped. Rich already
+# leaves out ANSI codes when the output is not a terminal.
+console = Console(highlight=False)
 
-def load_exclusions(exclude_file: str) -> List[str]:
+# Most analysis results the database writer stores in one executemany call
+RESULT_SAVE_BATCH_SIZE = 500
+
+
+# Lines of an exclusion file checked for a list item or the exclusions key
+# before the whole file is parsed
+EXCLUSIONS_HEADER_LINES = 64
+EXCLUSIONS_START = re.compile(r"(exclusions\s*:|-|\[|\{)")
+
+# User configuration file read by load_config
+USER_CONFIG_PATH = Path("~/.llm_organizer/config.yaml").expanduser()
+
+# Environment variables read by load_config
+CONFIG_ENV_VARS = ("OPENAI_API_KEY", "MODEL_NAME")
+
+
+def _get_config() -> AppConfig:
+    """
+    Load the configuration, reusing it while its sources are unchanged.
+
+    The configuration is parsed again when the user config file's
+    modification time or one of the configuration environment variables
+    changes.
+    """
+    try:
+        mtime = USER_CONFIG_PATH.stat().st_mtime_ns
+    except OSError:
+        mtime = None
+    return _load_config_for(mtime, tuple(os.getenv(name) for name in CONFIG_ENV_VARS))
+
+
+@lru_cache(maxsize=1)
+def _load_config_for(mtime: Optional[int], env: Tuple) -> AppConfig:
+    """Load the configuration; the arguments only key the cache."""
+    from llm_organizer.config.defaults import load_config
+
+    return load_config()
+
+
+# Seconds a successful API check is trusted before checking again
+API_CHECK_TTL = 300
+
+# Successful API checks by (API key hash, model name), kept for this process
+_api_checks: Dict[Tuple[str, str], float] = {}
+
+
+def _api_check_key(config: AppConfig) -> Tuple[str, str]:
+    """Get the API check cache key, with a hash standing in for the key."""
+    key_hash = hashlib.sha256(config.llm.api_key.encode("utf-8")).hexdigest()
+    return key_hash[:16], config.llm.model_name
+
+
+def _api_checks_file(config: AppConfig) -> Path:
+    """Get the file remembering successful API checks across invocations."""
+    return config.resolved_data_dir / "api_checks.json"
+
+
+def _api_recently_checked(config: AppConfig) -> bool:
+    """
+    Check whether the API key and model passed a check within API_CHECK_TTL.
+
+    Args:
+        config: Application configuration
+
+    Returns:
+        bool: True if a recent check succeeded, in this process or a previous one
+    """
+    key = _api_check_key(config)
+    if key not in _api_checks:
+        try:
+            with open(_api_checks_file(config), "r") as f:
+                checked = json.load(f).get("|".join(key))
+            if checked:
+                _api_checks[key] = checked
+        except (OSError, ValueError, AttributeError):
+            pass
+
+    return time.time() - _api_checks.get(key, 0) < API_CHECK_TTL
+
+
+def _remember_api_check(config: AppConfig) -> None:
+    """Record a successful API check for the configured key and model."""
+    key = _api_check_key(config)
+    _api_checks[key] = time.time()
+
+    path = _api_checks_file(config)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w") as f:
+            json.dump({"|".join(key): _api_checks[key]}, f)
+    except OSError:
+        pass
+
+
+def _get_indexer(settings: Dict[str, Any]) -> "FileIndexer":
+    """
+    Get a FileIndexer for the settings, reusing one built for equal settings.
+
+    Args:
+        settings: FileIndexer configuration dictionary
+
+    Returns:
+        FileIndexer: Indexer configured with the settings
+    """
+    key = tuple(
+        (name, tuple(value) if isinstance(value, list) else value)
+        for name, value in settings.items()
+    )
+    return _cached_indexer(key)
+
+
+@lru_cache(maxsize=4)
+def _cached_indexer(settings: Tuple) -> "FileIndexer":
+    """Build a FileIndexer from a settings tuple, see _get_indexer."""
+    from llm_organizer.core.indexer import FileIndexer
+
+    return FileIndexer(dict(settings))
+
+
+def _save_results(
+    db_path: str, files_metadata: List[dict], results: queue.Queue
+) -> None:
+    """
+    Store file metadata, then analysis results as they arrive on a queue.
+
+    Runs on a writer thread during the analysis, with its own connection to
+    the database, which the WAL journal lets it write while the analysis
+    reads cached results. A None item on the queue ends it.
+
+    Args:
+        db_path: Path to the metadata database
+        files_metadata: Scanner metadata of the analyzed files
+        results: Queue of analysis results, terminated by None
+    """
+    store = MetadataStore(db_path)
+    try:
+        store.save_metadata_rows(map(metadata_row, files_metadata))
+
+        done = False
+        while not done:
+            # Wait for a result, then take whatever else is already waiting
+            batch = [results.get()]
+            while len(batch) < RESULT_SAVE_BATCH_SIZE and not results.empty():
+                batch.append(results.get_nowait())
+            if batch[-1] is None:
+                done = True
+                batch.pop()
+
+            store.save_analysis_rows(map(analysis_row, batch))
+    except Exception as e:
+        console.print(f"⚠️ Could not save results to database: {e}", style="yellow")
+    finally:
+        store.close()
+
+
+def load_exclusions(exclude_file: str, cache_dir: Optional[Path] = None) -> List[str]:
     """
     Load exclusion patterns from a YAML file.
 
+    With a cache directory, the patterns of a file are cached there as JSON,
+    and reused while the file's modification time and size are unchanged.
+
     Args:
         exclude_file: Path to the YAML file containing exclusion patterns
+        cache_dir: Directory for the parsed patterns, usually config.cache_dir
 
     Returns:
         List of exclusion patterns
     """
+    path = os.path.abspath(exclude_file)
+    try:
+        stats = os.stat(path)
+    except OSError:
+        stats = None
+
+    cache_file = None
+    if stats is not None and cache_dir is not None:
+        # The file is parsed again once its modification time or size change
+        signature = [stats.st_mtime_ns, stats.st_size]
+        key = hashlib.sha256(path.encode("utf-8")).hexdigest()[:16]
+        cache_file = cache_dir / f"exclusions_{key}.json"
+        try:
+            with open(cache_file, "r") as f:
+                cached = json.load(f)
+            if cached["signature"] == signature:
+                return cached["patterns"]
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+
+    patterns = _parse_exclusions(exclude_file)
+
+    if cache_file is not None and patterns:
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(cache_file, "w") as f:
+                json.dump({"signature": signature, "patterns": patterns}, f)
+        except (OSError, TypeError):
+            pass
+
+    return patterns
+
+
+def _parse_exclusions(exclude_file: str) -> List[str]:
+    """Parse exclusion patterns from a YAML file, see load_exclusions."""
+    import yaml
+
+    # Prefer the libyaml-backed loader, which is much faster on large files
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
     patterns = []
 
     try:
         with open(exclude_file, "r") as f:
-            data = yaml.safe_load(f)
+            # A file in another format is rejected from its first lines,
+            # without parsing all of it
+            head = [line.lstrip() for line in islice(f, EXCLUSIONS_HEADER_LINES)]
+            content = [
+                line
+                for line in head
+                if line.strip() and not line.startswith(("#", "---"))
+            ]
+            if content and not any(EXCLUSIONS_START.match(line) for line in content):
+                console.print("[yellow]Warning:[/yellow] Invalid exclusion file format")
+                return patterns
+
+            f.seek(0)
+            data = yaml.load(f, Loader=loader)
 
         if not data:
             console.print("[yellow]Warning:[/yellow] Empty exclusion file")
@@ -52,7 +282,7 @@ def load_exclusions(exclude_file: str) -> List[str]:
 
 
 def organize_command(
-    directory: str,
+    directory: Union[str, Sequence[str]],
     recursive: bool = True,
     preview: bool = True,
     exclude: Optional[List[str]] = None,
@@ -60,12 +290,15 @@ def organize_command(
     open_report: bool = False,
     intelligent: bool = True,
     config: Optional[AppConfig] = None,
+    batch: Optional[bool] = None,
 ) -> None:
     """
-    Organize files in a directory using AI.
+    Organize files in one or more directories using AI.
 
     Args:
-        directory: Path to directory to organize
+        directory: Path to directory to organize, or a list of directories.
+            The organization plans of several directories are requested
+            concurrently, and executed (and undone) together.
         recursive: Whether to scan recursively
         preview: Whether to preview changes before executing
         exclude: List of patterns to exclude
@@ -73,6 +306,8 @@ def organize_command(
         open_report: Whether to open the HTML report automatically
         intelligent: Whether to use intelligent schema for organization
         config: Configuration object
+        batch: Whether to analyze files through the OpenAI Batch API
+            (default: when more files than llm.batch_threshold need analysis)
 
     The intelligent option uses a holistic approach to analyze all files together,
     creating a cohesive organization plan with categories and subcategories based on
@@ -80,9 +315,7 @@ def organize_command(
     """
     try:
         if config is None:
-            from llm_organizer.config.defaults import load_config
-
-            config = load_config()
+            config = _get_config()
 
         # Validate API key
         if not config.llm.api_key:
@@ -101,10 +334,14 @@ def organize_command(
             style="blue",
         )
 
+        directories = (
+            [directory] if isinstance(directory, (str, os.PathLike)) else directory
+        )
+
         # Combine exclusions from command line and file
         exclusions = list(exclude) if exclude else []
         if exclude_file:
-            file_exclusions = load_exclusions(exclude_file)
+            file_exclusions = load_exclusions(exclude_file, config.cache_dir)
             exclusions.extend(file_exclusions)
             console.print(
                 f"\n📄 Loaded {len(file_exclusions)} exclusion patterns from {exclude_file}",
@@ -116,29 +353,35 @@ def organize_command(
             exclusions.extend(config.scanner.exclude_patterns)
 
         # Initialize components
-        scanner = DirectoryScanner(exclude_patterns=exclusions, config=config)
-        indexer = FileIndexer(
+        from llm_organizer.core.scanner import DirectoryScanner
+        from llm_organizer.models.analysis_cache import (
+            CACHE_FILE_NAME as ANALYSIS_CACHE_FILE,
+        )
+
+        indexer = _get_indexer(
             {
                 "openai_api_key": config.llm.api_key,
                 "model_name": config.llm.model_name,
+                "max_concurrency": config.llm.max_concurrency,
+                "max_requests_per_minute": config.llm.max_requests_per_minute,
+                "max_tokens_per_minute": config.llm.max_tokens_per_minute,
+                "max_attempts": config.llm.max_attempts,
+                "batch_threshold": config.llm.batch_threshold,
                 "tags_naming_scheme": config.organizer.tags_naming_scheme,
                 "categories_naming_scheme": config.organizer.categories_naming_scheme,
                 "naming_scheme": config.organizer.naming_scheme,
+                "use_analysis_cache": config.organizer.use_cached_analysis,
+                "analysis_cache_path": str(config.cache_dir / ANALYSIS_CACHE_FILE),
+                "use_semantic_cache": config.organizer.semantic_analysis_cache,
+                "rule_based_categories": config.organizer.rule_based_categories,
             }
         )
-        organizer = FileOrganizer(config=config)
-        organizer.base_dir = Path(directory)
-
-        # Migrate any existing organizer files to the hidden folder
-        organizer.migrate_organizer_files()
 
         logger = OperationLogger()
 
         # Initialize SQLite database for storing metadata
-        from llm_organizer.models.file_metadata import MetadataStore
-
-        db_path = os.path.join(os.path.expanduser(config.data_dir), "file_metadata.db")
-        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        config.resolved_data_dir.mkdir(parents=True, exist_ok=True)
+        db_path = str(config.resolved_data_dir / "file_metadata.db")
         metadata_store = MetadataStore(db_path)
 
         console.print(f"\n💾 Using metadata database: {db_path}", style="blue")
@@ -166,131 +409,152 @@ def organize_command(
             )
             console.print("  - venv, node_modules, .git, __pycache__, dist, build")
 
-        # Scan directory
-        try:
-            console.print(f"\n📂 Scanning directory: {directory}")
-            files_metadata = scanner.scan_directory(directory, recursive)
-
-            if not files_metadata:
-                console.print("❌ No files found to organize!", style="red")
-                return
-
-            console.print(
-                f"📊 Found {len(files_metadata)} files to analyze", style="green"
-            )
-        except Exception as e:
-            console.print(f"❌ Error scanning directory: {str(e)}", style="red")
-            return
-
-        # Test API connection before processing
-        console.print("\n🔍 Testing API connection before analysis...")
-        if not indexer.test_api_connection():
-            console.print(
-                "❌ API connection failed. Please check your API key and try again.",
-                style="red",
-            )
-            console.print(
-                "Run 'llm-organizer test-api' for more detailed diagnostics.",
-                style="yellow",
+        # Organizer and analysis results of each directory with files
+        analyzed: Dict[str, Tuple[FileOrganizer, List[Dict]]] = {}
+        api_verified = False
+        for path in map(str, directories):
+            organizer = FileOrganizer(config=config)
+            organizer.base_dir = Path(path)
+
+            # The organizer's own files are never scanned, which lets the scan
+            # run while they are migrated
+            scanner = DirectoryScanner(
+                exclude_patterns=exclusions + organizer.organizer_exclude_patterns(),
+                config=config,
             )
-            return
 
-        # Save file metadata to database
-        console.print("\n💾 Saving file metadata to database...")
-        for metadata in files_metadata:
-            from datetime import datetime
-
-            # Convert ISO format strings to datetime objects
-            created = datetime.fromisoformat(metadata["created"])
-            modified = datetime.fromisoformat(metadata["modified"])
-
-            # Create FileMetadata object
-            from llm_organizer.models.file_metadata import FileMetadata
-
-            file_metadata = FileMetadata(
-                path=Path(metadata["path"]),
-                name=metadata["name"],
-                extension=metadata["extension"],
-                mime_type=metadata["mime_type"],
-                size=metadata["size"],
-                created=created,
-                modified=modified,
-                content=metadata["content"],
-                category=metadata.get("category", "Other"),
-            )
+            # Migrate any existing organizer files to the hidden folder, in the
+            # background while the directory is scanned
+            migration_pool = ThreadPoolExecutor(max_workers=1)
+            migration = migration_pool.submit(organizer.migrate_organizer_files)
+            migration_pool.shutdown(wait=False)
 
-            # Save to database
-            metadata_store.save_metadata(file_metadata)
+            # Scan directory
+            try:
+                console.print(f"\n📂 Scanning directory: {path}")
+                files_metadata = scanner.scan_directory(path, recursive)
 
-        # Analyze files
-        console.print("\n🔍 Analyzing files with AI...")
-        analysis_results = indexer.analyze_files(
-            scanner.get_files() if hasattr(scanner, "get_files") else files_metadata,
-            metadata_store=metadata_store,
-            use_cached=use_cached,
-        )
+                if not files_metadata:
+                    console.print("❌ No files found to organize!", style="red")
+                    continue
 
-        # Save analysis results to database
-        console.print("\n💾 Saving analysis results to database...")
-        for result in analysis_results:
-            from llm_organizer.models.file_metadata import FileAnalysis
-
-            file_analysis = FileAnalysis(
-                path=Path(result["path"]),
-                tags=result["tags"],
-                suggested_folder=result["suggested_folder"],
-                description=result["description"],
-                category=result.get("category", "Other"),
+                console.print(
+                    f"📊 Found {len(files_metadata)} files to analyze", style="green"
+                )
+            except Exception as e:
+                console.print(f"❌ Error scanning directory: {str(e)}", style="red")
+                continue
+            finally:
+                migration.result()
+
+            # Test API connection before the first analysis, unless it passed a
+            # moment ago
+            if not api_verified:
+                if _api_recently_checked(config):
+                    console.print(
+                        "\n✅ API connection verified recently", style="green"
+                    )
+                    indexer.mark_api_verified()
+                else:
+                    console.print("\n🔍 Testing API connection before analysis...")
+                    if not indexer.test_api_connection():
+                        console.print(
+                            "❌ API connection failed. Please check your API key and try again.",
+                            style="red",
+                        )
+                        console.print(
+                            "Run 'llm-organizer test-api' for more detailed diagnostics.",
+                            style="yellow",
+                        )
+                        return
+                    _remember_api_check(config)
+                api_verified = True
+
+            # Analyze files, saving the metadata and each result to the database
+            # on a writer thread while the analysis runs
+            console.print("\n🔍 Analyzing files with AI...")
+            saved_results = queue.Queue()
+            writer = threading.Thread(
+                target=_save_results, args=(db_path, files_metadata, saved_results)
             )
+            writer.start()
+            try:
+                analysis_results = indexer.analyze_files(
+                    (
+                        scanner.get_files()
+                        if hasattr(scanner, "get_files")
+                        else files_metadata
+                    ),
+                    metadata_store=metadata_store,
+                    use_cached=use_cached,
+                    batch=batch,
+                    on_result=saved_results.put,
+                )
+            finally:
+                saved_results.put(None)
+                console.print("\n💾 Saving file metadata and analysis results...")
+                writer.join()
 
-            # Save to database
-            metadata_store.save_analysis(file_analysis)
-
-        # Generate organization plan using all the collected data
-        console.print("\n📋 Generating organization plan...")
-        # Always use intelligent schema with the new workflow
-        organization_plan = organizer.generate_plan(
-            analysis_results, use_intelligent_schema=True
-        )
-
-        # Display preview
-        report_path = organizer.display_plan(organization_plan)
-
-        # Auto open the report in browser if requested
-        if open_report and report_path:
-            file_url = f"file://{os.path.abspath(report_path)}"
-            console.print(f"\n🌐 Opening report in browser: {file_url}", style="blue")
-            webbrowser.open(file_url)
+            analyzed[path] = (organizer, analysis_results)
 
-        if preview:
-            if Confirm.ask("\n❓ Do you want to proceed with these changes?"):
-                # Execute organization
-                console.print("\n🔄 Executing organization plan...")
-                operations = organizer.execute_plan(organization_plan)
+        if not analyzed:
+            metadata_store.close()
+            return
 
-                # Log operations
-                logger.log_operations(operations)
+        # Generate organization plans using all the collected data
+        console.print("\n📋 Generating organization plan...")
+        if len(analyzed) == 1:
+            # Always use intelligent schema with the new workflow
+            plans = {
+                path: organizer.generate_plan(
+                    analysis_results, use_intelligent_schema=True
+                )
+                for path, (organizer, analysis_results) in analyzed.items()
+            }
+        else:
+            # The schema requests of the directories run concurrently
+            plans = asyncio.run(
+                FileOrganizer(config=config).aorganize_many(
+                    {
+                        path: analysis_results
+                        for path, (_, analysis_results) in analyzed.items()
+                    }
+                )
+            )
 
-                # Generate master TOC
-                toc_path = organizer.generate_toc(organization_plan)
+        for path, (organizer, _) in analyzed.items():
+            # Display preview
+            report_path = organizer.display_plan(plans[path])
 
+            # Auto open the report in browser if requested
+            if open_report and report_path:
+                file_url = f"file://{os.path.abspath(report_path)}"
                 console.print(
-                    f"\n✅ Organization complete! Master TOC saved to: {toc_path}",
-                    style="green",
+                    f"\n🌐 Opening report in browser: {file_url}", style="blue"
                 )
-            else:
-                console.print("Operation cancelled by user.", style="yellow")
-                return
-        else:
-            # Execute organization
-            console.print("\n🔄 Executing organization plan...")
-            operations = organizer.execute_plan(organization_plan)
+                import webbrowser
+
+                webbrowser.open(file_url)
 
-            # Log operations
-            logger.log_operations(operations)
+        if preview and not Confirm.ask(
+            "\n❓ Do you want to proceed with these changes?"
+        ):
+            console.print("Operation cancelled by user.", style="yellow")
+            return
 
+        # Execute organization
+        console.print("\n🔄 Executing organization plan...")
+        # Log each operation as soon as it has been executed. All directories
+        # share one log, so undo reverts the whole run.
+        logger.log_operations(
+            operation
+            for path, (organizer, _) in analyzed.items()
+            for operation in organizer.iter_execute_plan(plans[path])
+        )
+
+        for path, (organizer, _) in analyzed.items():
             # Generate master TOC
-            toc_path = organizer.generate_toc(organization_plan)
+            toc_path = organizer.generate_toc(plans[path])
 
             console.print(
                 f"\n✅ Organization complete! Master TOC saved to: {toc_path}",
@@ -337,9 +601,7 @@ def test_api_command(config: Optional[AppConfig] = None) -> None:
         console.print("\n🔍 Testing OpenAI API connection...", style="blue")
 
         if config is None:
-            from llm_organizer.config.defaults import load_config
-
-            config = load_config()
+            config = _get_config()
 
         if not config.llm.api_key:
             console.print("❌ OpenAI API key not found in configuration.", style="red")
@@ -356,9 +618,9 @@ def test_api_command(config: Optional[AppConfig] = None) -> None:
 
         # First, test with direct OpenAI API
         try:
-            from openai import OpenAI
+            from llm_organizer.core.client import get_openai_client
 
-            client = OpenAI(api_key=api_key)
+            client = get_openai_client(api_key)
             response = client.chat.completions.create(
                 model=config.llm.model_name,
                 messages=[
@@ -384,18 +646,19 @@ def test_api_command(config: Optional[AppConfig] = None) -> None:
             console.print(f"\n❌ Error with direct OpenAI API: {str(e)}", style="red")
             return
 
-        # Then, test with llama_index
-        console.print("\n🔍 Testing LlamaIndex integration...", style="blue")
-        indexer = FileIndexer(
+        # Then, run the check the indexer performs before analysis
+        console.print("\n🔍 Testing file analysis setup...", style="blue")
+        indexer = _get_indexer(
             {"openai_api_key": config.llm.api_key, "model_name": config.llm.model_name}
         )
-        if indexer.test_api_connection():
+        if indexer.test_api_connection(force=True):
+            _remember_api_check(config)
             console.print(
                 "\n✅ API setup verified and working correctly!", style="green"
             )
         else:
             console.print(
-                "\n❌ Error with LlamaIndex integration. Direct API works but LlamaIndex integration fails.",
+                "\n❌ Error with file analysis setup. Direct API works but the analysis model check fails.",
                 style="red",
             )
 
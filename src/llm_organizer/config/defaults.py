@@ -1,7 +1,8 @@
 """Default configuration and configuration loading utilities."""
 
-import json
+import copy
 import os
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict, Optional
 
@@ -9,6 +10,10 @@ import yaml
 from dotenv import load_dotenv
 
 from llm_organizer.config.schema import AppConfig, LLMConfig
+from llm_organizer.utils import fast_json
+
+# libyaml's loader is much faster than the pure Python one when available
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
 
 
 def load_env_config() -> Dict[str, Any]:
@@ -25,24 +30,43 @@ def load_env_config() -> Dict[str, Any]:
 
 def load_yaml_config(config_path: str) -> Dict[str, Any]:
     """Load configuration from a YAML file."""
-    path = Path(config_path).expanduser()
-
-    if not path.exists():
-        return {}
-
-    with open(path, "r") as f:
-        return yaml.safe_load(f) or {}
+    return _load_config_file(config_path)
 
 
 def load_json_config(config_path: str) -> Dict[str, Any]:
     """Load configuration from a JSON file."""
+    return _load_config_file(config_path)
+
+
+def _load_config_file(config_path: str) -> Dict[str, Any]:
+    """Load a YAML or JSON config file, or nothing if it doesn't exist."""
     path = Path(config_path).expanduser()
 
-    if not path.exists():
+    # One stat both checks for the file and keys the parse cache
+    try:
+        mtime_ns = path.stat().st_mtime_ns
+    except FileNotFoundError:
         return {}
 
-    with open(path, "r") as f:
-        return json.load(f)
+    return copy.deepcopy(_parse_config_file(str(path), mtime_ns))
+
+
+@lru_cache(maxsize=8)
+def _parse_config_file(path: str, mtime_ns: int) -> Dict[str, Any]:
+    """
+    Parse a YAML or JSON config file, reusing the result while it is unchanged.
+
+    Args:
+        path: Path of the config file
+        mtime_ns: Modification time of the file; only keys the cache
+
+    Returns:
+        Dict[str, Any]: Parsed configuration, shared between callers
+    """
+    data = Path(path).read_bytes()
+    if path.lower().endswith(".json"):
+        return fast_json.loads(data)
+    return yaml.load(data, Loader=YAML_LOADER) or {}
 
 
 def load_config(config_path: Optional[str] = None) -> AppConfig:
@@ -68,10 +92,8 @@ def load_config(config_path: Optional[str] = None) -> AppConfig:
     config_data.update(env_config)
 
     # Load user config if it exists
-    user_config_path = Path("~/.llm_organizer/config.yaml").expanduser()
-    if user_config_path.exists():
-        user_config = load_yaml_config(str(user_config_path))
-        config_data.update(user_config)
+    user_config = load_yaml_config("~/.llm_organizer/config.yaml")
+    config_data.update(user_config)
 
     # Load provided config if specified
     if config_path:
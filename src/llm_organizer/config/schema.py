@@ -1,8 +1,10 @@
 """Configuration schema for the LLM Organizer."""
 
-from typing import Any, Dict, List
+from functools import cached_property
+from pathlib import Path
+from typing import Any, Dict, List, Optional
 
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, Field, field_validator
 
 
 class LLMConfig(BaseModel):
@@ -15,8 +17,26 @@ class LLMConfig(BaseModel):
     )
     max_tokens: int = Field(4096, description="Maximum tokens to use in API calls")
     temperature: float = Field(0.7, description="Sampling temperature")
+    max_concurrency: int = Field(
+        20, description="Maximum number of file analysis requests in flight"
+    )
+    max_requests_per_minute: int = Field(
+        500, description="Request rate limit for file analysis"
+    )
+    max_tokens_per_minute: int = Field(
+        200000, description="Token rate limit for file analysis"
+    )
+    max_attempts: int = Field(
+        5, description="Attempts per analysis request on rate limit or API errors"
+    )
+    batch_threshold: Optional[int] = Field(
+        None,
+        description="Analyze through the OpenAI Batch API when more files than "
+        "this need analysis (cheaper but slower, None disables)",
+    )
 
-    @validator("api_key")
+    @field_validator("api_key")
+    @classmethod
     def api_key_must_not_be_empty(cls, v):
         """Validate that the API key is not empty."""
         if not v or not v.strip():
@@ -40,6 +60,17 @@ class ScannerConfig(BaseModel):
     exclude_hidden: bool = Field(
         True, description="Whether to exclude hidden files and directories"
     )
+    max_workers: Optional[int] = Field(
+        None,
+        description="Threads used to read file metadata and content "
+        "(default: 4 per CPU, at most 32)",
+    )
+    use_metadata_cache: bool = Field(
+        True, description="Whether to reuse metadata of files unchanged since a scan"
+    )
+    metadata_cache_size: int = Field(
+        10_000, description="Maximum number of files kept in the metadata cache"
+    )
     file_categories: Dict[str, List[str]] = Field(
         default_factory=lambda: {
             "Documents": [".txt", ".md", ".doc", ".docx", ".pdf", ".rtf", ".odt"],
@@ -66,6 +97,15 @@ class ScannerConfig(BaseModel):
         description="Mapping of file categories to their extensions",
     )
 
+    @cached_property
+    def ext_to_category(self) -> Dict[str, str]:
+        """Category of each configured extension; the first listed category wins."""
+        mapping: Dict[str, str] = {}
+        for category, extensions in self.file_categories.items():
+            for extension in extensions:
+                mapping.setdefault(extension.lower(), category)
+        return mapping
+
 
 class OrganizerConfig(BaseModel):
     """Configuration for the file organizer."""
@@ -90,9 +130,33 @@ class OrganizerConfig(BaseModel):
         [".git", "package.json", "pyproject.toml", "Cargo.toml", "Makefile"],
         description="Files/directories that indicate a project directory",
     )
+    rule_based_categories: List[str] = Field(
+        ["Images", "Videos", "Audio", "Archives", "Executables"],
+        description="File categories classified by type without calling the LLM",
+    )
     use_cached_analysis: bool = Field(
         True, description="Whether to use cached analysis from database when available"
     )
+    semantic_analysis_cache: bool = Field(
+        False,
+        description="Reuse the cached analysis of a file with similar content "
+        "(embedding similarity); costs an embedding request per new file",
+    )
+    batch_mode: bool = Field(
+        False,
+        description="Request intelligent organization schemas through the OpenAI "
+        "Batch API (half the price, may take hours)",
+    )
+    schema_cache_ttl_hours: float = Field(
+        24.0,
+        description="Hours an intelligent organization schema is reused for an "
+        "identical request (0 disables the cache)",
+    )
+    llm_concurrency: int = Field(
+        5,
+        description="Maximum number of organization schema requests in flight "
+        "when organizing several directories at once",
+    )
 
 
 class AppConfig(BaseModel):
@@ -110,3 +174,13 @@ class AppConfig(BaseModel):
     extra: Dict[str, Any] = Field(
         default_factory=dict, description="Extra configuration options"
     )
+
+    @cached_property
+    def resolved_data_dir(self) -> Path:
+        """Absolute application data directory, resolved once per config."""
+        return Path(self.data_dir).expanduser().resolve()
+
+    @property
+    def cache_dir(self) -> Path:
+        """Directory of the persistent caches, inside the data directory."""
+        return self.resolved_data_dir / "cache"
@@ -0,0 +1,175 @@
+"""Helpers for submitting chat completion requests through the OpenAI Batch API."""
+
+import json
+import time
+from typing import Dict, List
+
+BATCH_ENDPOINT = "/v1/chat/completions"
+
+# Batch statuses after which polling stops
+TERMINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+# Longest wait between status checks of a running batch, in seconds
+MAX_POLL_INTERVAL = 600.0
+
+
+def build_batch_line(custom_id: str, body: Dict) -> str:
+    """
+    Build one JSONL request line for a batch input file.
+
+    Args:
+        custom_id (str): Identifier used to match the response to the request
+        body (Dict): Chat completion request body
+
+    Returns:
+        str: JSON encoded request line
+    """
+    return json.dumps(
+        {
+            "custom_id": custom_id,
+            "method": "POST",
+            "url": BATCH_ENDPOINT,
+            "body": body,
+        },
+        ensure_ascii=False,
+    )
+
+
+def run_batch(
+    client, lines: List[str], poll_interval: float = 30.0, completion_window="24h"
+) -> Dict[str, str]:
+    """
+    Upload request lines as a batch, wait for it to finish and collect the answers.
+
+    Args:
+        client: Synchronous OpenAI client
+        lines (List[str]): JSONL request lines built with build_batch_line
+        poll_interval (float): Seconds to wait before the first status check
+        completion_window (str): Completion window requested for the batch
+
+    Returns:
+        Dict[str, str]: Message content of each successful response by custom_id
+
+    Raises:
+        RuntimeError: If the batch does not complete successfully
+    """
+    batch_id = submit_batch(client, lines, completion_window)
+    return wait_for_batch(client, batch_id, poll_interval)
+
+
+def submit_batch(client, lines: List[str], completion_window="24h") -> str:
+    """
+    Upload request lines and create a batch from them.
+
+    Args:
+        client: Synchronous OpenAI client
+        lines (List[str]): JSONL request lines built with build_batch_line
+        completion_window (str): Completion window requested for the batch
+
+    Returns:
+        str: ID of the created batch
+    """
+    payload = ("\n".join(lines) + "\n").encode("utf-8")
+    batch_file = client.files.create(
+        file=("batch_requests.jsonl", payload), purpose="batch"
+    )
+    batch = client.batches.create(
+        input_file_id=batch_file.id,
+        endpoint=BATCH_ENDPOINT,
+        completion_window=completion_window,
+    )
+    return batch.id
+
+
+def wait_for_batch(
+    client,
+    batch_id: str,
+    poll_interval: float = 30.0,
+    max_poll_interval: float = MAX_POLL_INTERVAL,
+) -> Dict[str, str]:
+    """
+    Wait for a batch to finish and collect its answers.
+
+    The wait between status checks doubles after each check, up to
+    max_poll_interval, so long-running batches are polled rarely.
+
+    Args:
+        client: Synchronous OpenAI client
+        batch_id (str): ID of the batch
+        poll_interval (float): Seconds to wait before the first status check
+        max_poll_interval (float): Longest wait between status checks
+
+    Returns:
+        Dict[str, str]: Message content of each successful response by custom_id
+
+    Raises:
+        RuntimeError: If the batch does not complete successfully
+    """
+    batch = client.batches.retrieve(batch_id)
+    while batch.status not in TERMINAL_STATUSES:
+        time.sleep(poll_interval)
+        poll_interval = min(poll_interval * 2, max_poll_interval)
+        batch = client.batches.retrieve(batch_id)
+
+    if batch.status != "completed":
+        raise RuntimeError(f"Batch {batch.id} ended with status '{batch.status}'")
+
+    results = {}
+    if not batch.output_file_id:
+        # Every request failed; details are in the batch's error file
+        return results
+
+    output = client.files.content(batch.output_file_id).text
+    for line in output.splitlines():
+        if not line.strip():
+            continue
+
+        record = json.loads(line)
+        response = record.get("response") or {}
+        if response.get("status_code") != 200:
+            continue
+
+        choices = response["body"].get("choices") or []
+        if choices:
+            results[record["custom_id"]] = choices[0]["message"]["content"]
+
+    return results
+
+
+class BatchQueue:
+    """Chat completion requests collected to be submitted as one batch."""
+
+    def __init__(self):
+        """Initialize an empty queue."""
+        self.lines: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self.lines)
+
+    def add(self, custom_id: str, body: Dict) -> None:
+        """
+        Queue a chat completion request.
+
+        Args:
+            custom_id (str): Identifier of the request's answer in the results
+            body (Dict): Chat completion request body
+        """
+        self.lines.append(build_batch_line(custom_id, body))
+
+    def run(self, client, poll_interval: float = 30.0) -> Dict[str, str]:
+        """
+        Submit the queued requests as one batch and wait for the answers.
+
+        Args:
+            client: Synchronous OpenAI client
+            poll_interval (float): Seconds to wait before the first status check
+
+        Returns:
+            Dict[str, str]: Message content of each successful response by custom_id
+
+        Raises:
+            RuntimeError: If the batch does not complete successfully
+        """
+        results = run_batch(client, self.lines, poll_interval=poll_interval)
+        self.lines = []
+        return results
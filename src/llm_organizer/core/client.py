@@ -0,0 +1,49 @@
+"""Shared OpenAI API clients."""
+
+from functools import lru_cache
+
+import httpx
+import openai
+
+# Connection pool size of the HTTP clients, sized for concurrent analysis
+HTTP_LIMITS = httpx.Limits(max_connections=64, max_keepalive_connections=32)
+
+
+@lru_cache(maxsize=None)
+def get_openai_client(api_key: str) -> openai.OpenAI:
+    """
+    Get the process-wide synchronous client for an API key.
+
+    The client keeps its connections alive, so repeated calls reuse them
+    instead of opening a new TLS connection each time.
+
+    Args:
+        api_key (str): OpenAI API key
+
+    Returns:
+        openai.OpenAI: Shared client
+    """
+    return openai.OpenAI(
+        api_key=api_key, http_client=openai.DefaultHttpxClient(limits=HTTP_LIMITS)
+    )
+
+
+def create_async_openai_client(api_key: str, **kwargs) -> openai.AsyncOpenAI:
+    """
+    Create an asynchronous client with the shared connection limits.
+
+    Async clients are bound to the event loop they are used on, so a new one is
+    created for each asyncio.run() instead of being cached.
+
+    Args:
+        api_key (str): OpenAI API key
+        **kwargs: Extra client options, e.g. max_retries
+
+    Returns:
+        openai.AsyncOpenAI: New client, to be closed by the caller
+    """
+    return openai.AsyncOpenAI(
+        api_key=api_key,
+        http_client=openai.DefaultAsyncHttpxClient(limits=HTTP_LIMITS),
+        **kwargs,
+    )
@@ -1,19 +1,110 @@
 """File indexer module for analyzing files with LLM."""
 
+import asyncio
 import json
+import random
 import re
-from typing import Dict, List
+import time
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple
 
-from llama_index.core import Document, VectorStoreIndex
-from llama_index.core.settings import Settings
-from llama_index.llms.openai import OpenAI
-from tqdm import tqdm
+from llm_organizer.core.batch import build_batch_line, run_batch
+from llm_organizer.models.analysis_cache import AnalysisCache
+from llm_organizer.utils import fast_json, get_naming_formatter
 
-from llm_organizer.utils import format_naming_scheme
+# The OpenAI SDK and tqdm are imported where requests are made, so runs that
+# are answered from the caches don't pay for loading them
+if TYPE_CHECKING:
+    import openai
+
+ANALYSIS_SYSTEM_PROMPT = (
+    "You are a file analysis assistant helping to organize a directory. "
+    "Answer using only the file information provided and respond in JSON."
+)
+
+ANALYSIS_PROMPT = (
+    "Analyze this file and return a JSON object with exactly these keys:\n"
+    '- "tags": an array of the most relevant tags or categories (strings)\n'
+    '- "suggested_folder": an appropriate folder name for organizing this file\n'
+    '- "description": a brief description of the file (max 2 sentences)'
+)
+
+FALLBACK_DESCRIPTION = "Could not analyze file content"
+
+# Outermost JSON object in an answer that wraps it in other text
+JSON_OBJECT_RE = re.compile(r"\{.*\}", re.DOTALL)
+
+# First JSON array in a free-form tags answer
+TAGS_ARRAY_RE = re.compile(r"\[(.*?)\]", re.DOTALL)
+
+# Maximum number of inputs sent in one embeddings request
+EMBEDDING_BATCH_SIZE = 256
+
+# Scanner categories whose files are classified by type instead of by the LLM
+DEFAULT_RULE_BASED_CATEGORIES = ("Images", "Videos", "Audio", "Archives", "Executables")
+
+# Minimum seconds between progress bar redraws
+PROGRESS_MIN_INTERVAL = 0.5
+
+
+class RateLimiter:
+    """Token-bucket throttle for requests-per-minute and tokens-per-minute limits."""
+
+    def __init__(self, max_requests_per_minute: int, max_tokens_per_minute: int):
+        """
+        Initialize the limiter with full buckets.
+
+        Args:
+            max_requests_per_minute (int): Maximum number of requests per minute
+            max_tokens_per_minute (int): Maximum number of tokens per minute
+        """
+        self.max_requests_per_minute = max_requests_per_minute
+        self.max_tokens_per_minute = max_tokens_per_minute
+        self._available_requests = float(max_requests_per_minute)
+        self._available_tokens = float(max_tokens_per_minute)
+        self._last_update = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        """Replenish both buckets according to the time elapsed."""
+        now = time.monotonic()
+        elapsed = now - self._last_update
+        self._last_update = now
+        self._available_requests = min(
+            self.max_requests_per_minute,
+            self._available_requests + elapsed * self.max_requests_per_minute / 60,
+        )
+        self._available_tokens = min(
+            self.max_tokens_per_minute,
+            self._available_tokens + elapsed * self.max_tokens_per_minute / 60,
+        )
+
+    async def acquire(self, tokens: int) -> None:
+        """
+        Wait until capacity is available for one request of the given size.
+
+        Args:
+            tokens (int): Estimated number of tokens the request will consume
+        """
+        # A single request can never need more than a full bucket
+        tokens = min(tokens, self.max_tokens_per_minute)
+
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._available_requests >= 1 and self._available_tokens >= tokens:
+                    self._available_requests -= 1
+                    self._available_tokens -= tokens
+                    return
+
+                wait = max(
+                    (1 - self._available_requests) * 60 / self.max_requests_per_minute,
+                    (tokens - self._available_tokens) * 60 / self.max_tokens_per_minute,
+                )
+                await asyncio.sleep(wait)
 
 
 class FileIndexer:
-    """Handles file indexing and LLM analysis using LlamaIndex."""
+    """Handles file indexing and LLM analysis with direct chat completion calls."""
 
     def __init__(self, config: Dict):
         """
@@ -23,10 +114,6 @@ class FileIndexer:
             config (Dict): Configuration dictionary containing API keys and model settings
         """
         self.config = config
-        self.llm = OpenAI(api_key=config["openai_api_key"], model=config["model_name"])
-        Settings.llm = self.llm
-        Settings.chunk_size = 512
-        Settings.chunk_overlap = 20
 
         # Set default naming schemes
         self.tags_naming_scheme = config.get("tags_naming_scheme", "snake_case")
@@ -34,37 +121,88 @@ class FileIndexer:
             "categories_naming_scheme", "pascal_case"
         )
         self.folder_naming_scheme = config.get("naming_scheme", "snake_case")
+        # Formatters for the schemes, resolved once instead of for every name
+        self._format_tag = get_naming_formatter(self.tags_naming_scheme)
+        self._format_category = get_naming_formatter(self.categories_naming_scheme)
+        self._format_folder = get_naming_formatter(self.folder_naming_scheme)
+
+        # Concurrency, rate limit and retry settings for the analysis requests
+        self.max_concurrency = config.get("max_concurrency", 20)
+        self.max_requests_per_minute = config.get("max_requests_per_minute", 500)
+        self.max_tokens_per_minute = config.get("max_tokens_per_minute", 200000)
+        self.max_attempts = config.get("max_attempts", 5)
+        self.retry_base_delay = config.get("retry_base_delay", 1.0)
+        self.max_completion_tokens = config.get("max_completion_tokens", 256)
+
+        # Use the Batch API when more files than this need analysis (None disables)
+        self.batch_threshold = config.get("batch_threshold")
+        self.batch_poll_interval = config.get("batch_poll_interval", 30.0)
+
+        # Files classified without an LLM call (empty files are always included)
+        self.rule_based_categories = set(
+            config.get("rule_based_categories", DEFAULT_RULE_BASED_CATEGORIES)
+        )
 
-    def test_api_connection(self) -> bool:
+        # Content-hash cache of previous analyses, stored at
+        # analysis_cache_path. Reusing the analysis of a file with similar
+        # content (by embedding similarity) is opt-in, as it costs an
+        # embedding request per new file.
+        self.analysis_cache_path = config.get("analysis_cache_path")
+        self.use_analysis_cache = (
+            config.get("use_analysis_cache", False)
+            and self.analysis_cache_path is not None
+        )
+        self.use_semantic_cache = config.get("use_semantic_cache", False)
+        self.semantic_cache_threshold = config.get("semantic_cache_threshold", 0.92)
+        self.embedding_model = config.get("embedding_model", "text-embedding-3-small")
+
+        # Set once the API connection has been verified, see test_api_connection
+        self._api_ok = False
+
+    def test_api_connection(self, force: bool = False) -> bool:
         """
         Test the API connection to ensure it's working properly.
 
+        A successful test is remembered, so later calls return without a
+        request unless forced.
+
+        Args:
+            force (bool): Whether to test again after an earlier success
+
         Returns:
             bool: True if connection is successful, False otherwise
         """
-        try:
-            # Create a simple test document
-            doc_text = "This is a test document to verify API connectivity."
-            document = Document(text=doc_text)
+        if self._api_ok and not force:
+            return True
 
-            # Create a simple index
-            index = VectorStoreIndex.from_documents([document])
+        try:
+            from llm_organizer.core.client import get_openai_client
 
-            # Try a simple query
-            query_engine = index.as_query_engine()
-            response = query_engine.query("What is this document about?")
+            # Retrieving the model checks the key and model access without
+            # spending any tokens
+            client = get_openai_client(self.config["openai_api_key"])
+            model = client.models.retrieve(self.config["model_name"])
 
-            # If we get here, it worked
             print("✅ API connection successful!")
-            print(f"Response: {response}")
+            print(f"Model available: {model.id}")
+            self._api_ok = True
             return True
 
         except Exception as e:
             print(f"❌ API connection failed: {str(e)}")
             return False
 
+    def mark_api_verified(self):
+        """Treat the API connection as tested, e.g. after a recent check."""
+        self._api_ok = True
+
     def analyze_files(
-        self, files_metadata: List[Dict], metadata_store=None, use_cached=True
+        self,
+        files_metadata: List[Dict],
+        metadata_store=None,
+        use_cached=True,
+        batch: Optional[bool] = None,
+        on_result: Optional[Callable[[Dict], None]] = None,
     ) -> List[Dict]:
         """
         Analyze files using LLM to extract tags and suggested folders.
@@ -73,17 +211,34 @@ class FileIndexer:
             files_metadata (List[Dict]): List of file metadata dictionaries
             metadata_store: Optional MetadataStore instance to check for cached results
             use_cached: Whether to use cached analysis results
+            batch: Whether to submit the requests through the OpenAI Batch API.
+                Defaults to using it when more files than the configured
+                batch_threshold need analysis.
+            on_result: Optional callback receiving each result as soon as it is
+                available, e.g. to store results while the analysis runs
 
         Returns:
             List[Dict]: List of file metadata with analysis results added
         """
-        # Test API connection before processing files
-        print("\n🔍 Testing API connection before analysis...")
+        results = []
+        emitted = 0
+
+        def emit_new_results():
+            """Pass the results added since the last call to on_result."""
+            nonlocal emitted
+            if on_result:
+                for result in results[emitted:]:
+                    on_result(result)
+            emitted = len(results)
+
+        # Test API connection before processing files, unless already verified
+        if not self._api_ok:
+            print("\n🔍 Testing API connection before analysis...")
         if not self.test_api_connection():
             print(
                 "❌ API connection test failed. Please check your API key and try again."
             )
-            return [
+            results = [
                 {
                     "path": metadata["path"],
                     "tags": ["unclassified"],
@@ -92,23 +247,25 @@ class FileIndexer:
                 }
                 for metadata in files_metadata
             ]
+            emit_new_results()
+            return results
 
-        results = []
         files_to_analyze = []
 
         # Check for cached results if metadata_store is provided and use_cached is True
         if metadata_store and use_cached:
+            files_metadata = list(files_metadata)
+            cached = metadata_store.get_file_analyses(
+                metadata["path"] for metadata in files_metadata
+            )
             for metadata in files_metadata:
-                file_path = metadata["path"]
-                if metadata_store.has_analysis(file_path):
+                cached_analysis = cached.get(metadata["path"])
+                if cached_analysis:
                     # Use cached result
-                    cached_analysis = metadata_store.get_file_analysis(file_path)
-                    if cached_analysis:
-                        results.append(cached_analysis)
-                        continue
-
-                # If no cached result, add to list of files to analyze
-                files_to_analyze.append(metadata)
+                    results.append(cached_analysis)
+                else:
+                    # If no cached result, add to list of files to analyze
+                    files_to_analyze.append(metadata)
         else:
             # If not using cache, analyze all files
             files_to_analyze = files_metadata
@@ -119,82 +276,480 @@ class FileIndexer:
                 f"\n📊 Using {len(results)} cached results, analyzing {len(files_to_analyze)} new files"
             )
 
+        # Classify files whose type already says where they belong
+        files_to_analyze = self._apply_rules(files_to_analyze, results)
+        emit_new_results()
+
         # If no files need analysis, return the cached results
         if not files_to_analyze:
             return results
 
-        for metadata in tqdm(files_to_analyze, desc="Analyzing files"):
-            try:
-                # Create document for indexing
-                doc_text = self._prepare_document_text(metadata)
-                document = Document(text=doc_text)
+        analysis_cache = None
+        cache_entries = []
+        if self.use_analysis_cache:
+            analysis_cache = AnalysisCache(
+                self.analysis_cache_path,
+                self.semantic_cache_threshold if self.use_semantic_cache else None,
+                scope=self._analysis_cache_scope(),
+            )
+
+        try:
+            if analysis_cache is not None:
+                files_to_analyze, cache_entries = self._check_analysis_cache(
+                    analysis_cache, files_to_analyze, results
+                )
+                emit_new_results()
+
+            if files_to_analyze:
+                analyzed = self._run_analysis(files_to_analyze, batch, on_result)
+                results.extend(analyzed)
+                # _run_analysis passed these to on_result as they completed
+                emitted = len(results)
+
+                if analysis_cache is not None:
+                    analysis_cache.put_many(
+                        [
+                            (key, analysis, embedding)
+                            for (key, embedding), analysis in zip(
+                                cache_entries, analyzed
+                            )
+                            if analysis["description"] != FALLBACK_DESCRIPTION
+                        ]
+                    )
+        finally:
+            if analysis_cache is not None:
+                analysis_cache.close()
 
-                # Create index for the documen
-                index = VectorStoreIndex.from_documents([document])
+        return results
 
-                # Query the LLM for analysis
-                query_engine = index.as_query_engine()
+    def _apply_rules(self, files: List[Dict], results: List[Dict]) -> List[Dict]:
+        """
+        Classify empty files and files of rule-based categories by type.
 
-                # Get tags
-                tags_response = query_engine.query(
-                    "What are the most relevant tags or categories for this file? "
-                    "Return only a JSON array of strings."
-                )
+        Images that carry a text description (from EXIF) still go to the LLM.
 
-                # Get folder suggestion
-                folder_response = query_engine.query(
-                    "Based on the file's content and metadata, suggest an appropriate folder "
-                    "name for organizing this file. Return only a single string."
-                )
+        Args:
+            files (List[Dict]): Metadata of the files that need analysis
+            results (List[Dict]): List the rule-based results are appended to
 
-                # Get description
-                description_response = query_engine.query(
-                    "Provide a brief (max 2 sentences) description of this file. "
-                    "Return only the description text."
+        Returns:
+            List[Dict]: Files that still need LLM analysis
+        """
+        remaining = []
+        classified = 0
+        for metadata in files:
+            category = metadata.get("category", "Other")
+            if metadata["size"] == 0:
+                results.append(
+                    self._rule_based_analysis(metadata, "empty", "empty", "Empty file.")
+                )
+            elif category in self.rule_based_categories and not metadata["content"]:
+                file_type = metadata["extension"].lstrip(".") or "unknown"
+                description = f"{file_type.upper()} file, classified by its type."
+                results.append(
+                    self._rule_based_analysis(
+                        metadata, category, file_type, description
+                    )
                 )
+            else:
+                remaining.append(metadata)
+                continue
+            classified += 1
+
+        if classified:
+            print(f"📊 Classified {classified} files by type without the LLM")
+        return remaining
+
+    def _rule_based_analysis(
+        self, metadata: Dict, folder: str, tag: str, description: str
+    ) -> Dict:
+        """Build an analysis result from a file's type alone."""
+        category = metadata.get("category", "Other")
+        return {
+            "path": metadata["path"],
+            "tags": [self._format_tag(tag)],
+            "suggested_folder": self._format_folder(folder),
+            "description": description,
+            "category": self._format_category(category),
+        }
+
+    def _run_analysis(
+        self,
+        files_to_analyze: List[Dict],
+        batch: Optional[bool],
+        on_result: Optional[Callable[[Dict], None]] = None,
+    ) -> List[Dict]:
+        """
+        Analyze files with the Batch API or concurrent online requests.
 
-                # Parse and format tags according to naming scheme
-                tags = self._parse_tags_response(str(tags_response))
-                formatted_tags = [
-                    format_naming_scheme(tag, self.tags_naming_scheme) for tag in tags
-                ]
+        Each result is also passed to on_result, if given, once available.
+        """
+        if batch is None:
+            batch = (
+                self.batch_threshold is not None
+                and len(files_to_analyze) > self.batch_threshold
+            )
 
-                # Format folder name according to naming scheme
-                suggested_folder = format_naming_scheme(
-                    str(folder_response).strip(), self.folder_naming_scheme
-                )
+        if batch:
+            try:
+                results = self._analyze_batch(files_to_analyze)
+            except Exception as e:
+                print(f"❌ Batch analysis failed, falling back to online mode: {e}")
+            else:
+                if on_result:
+                    for result in results:
+                        on_result(result)
+                return results
 
-                # Get category from metadata or use a default
-                category = metadata.get("category", "Other")
-                formatted_category = format_naming_scheme(
-                    category, self.categories_naming_scheme
-                )
+        return asyncio.run(self._analyze_async(files_to_analyze, on_result))
 
-                analysis = {
-                    "path": metadata["path"],
-                    "tags": formatted_tags,
-                    "suggested_folder": suggested_folder,
-                    "description": str(description_response).strip(),
-                    "category": formatted_category,
-                }
+    def _check_analysis_cache(
+        self, analysis_cache: AnalysisCache, files: List[Dict], results: List[Dict]
+    ) -> Tuple[List[Dict], List[Tuple[str, Optional[List[float]]]]]:
+        """
+        Reuse cached analyses for files with identical or similar content.
+
+        Cache hits are appended to results. Exact matches are found by content
+        hash; the remaining distinct texts of files with content are embedded
+        in batched requests and compared against the cached embeddings. Files
+        without content are described by metadata alone, which looks alike
+        for all of them, so they only reuse exact matches.
+
+        Args:
+            analysis_cache (AnalysisCache): Cache to look results up in
+            files (List[Dict]): Metadata of the files that need analysis
+            results (List[Dict]): List the reused analyses are appended to
+
+        Returns:
+            Tuple: Files still needing analysis, and the (key, embedding) pair
+                of each of them for storing their results afterwards
+        """
+        misses = []
+        exact_hits = 0
+        for metadata in files:
+            doc_text = self._prepare_document_text(metadata)
+            key = analysis_cache.content_key(doc_text)
+            cached = analysis_cache.get(key)
+            if cached:
+                results.append(self._from_cached_analysis(metadata, cached))
+                exact_hits += 1
+            else:
+                misses.append((metadata, key, doc_text))
+
+        # Files with identical document text are embedded once
+        embeddings: Dict[str, List[float]] = {}
+        if misses and analysis_cache.semantic_enabled:
+            texts = {
+                key: doc_text
+                for metadata, key, doc_text in misses
+                if metadata.get("content")
+            }
+            try:
+                embeddings = dict(zip(texts, self._embed(list(texts.values()))))
+            except Exception as e:
+                print(f"⚠️ Could not embed files, skipping similarity lookup: {e}")
+
+        remaining, entries, reused = [], [], []
+        for metadata, key, _ in misses:
+            embedding = embeddings.get(key)
+            similar = analysis_cache.find_similar(embedding) if embedding else None
+            if similar:
+                results.append(self._from_cached_analysis(metadata, similar))
+                reused.append((key, similar, embedding))
+            else:
+                remaining.append(metadata)
+                entries.append((key, embedding))
+
+        # Remember similar matches under their own key for exact hits next time
+        if reused:
+            analysis_cache.put_many(reused)
 
-                results.append(analysis)
+        print(
+            f"\n📊 Reused {exact_hits + len(reused)} cached analyses "
+            f"({len(reused)} similar), analyzing {len(remaining)} files"
+        )
+        return remaining, entries
+
+    def _analysis_cache_scope(self) -> str:
+        """Get the settings a cached analysis is only valid for."""
+        return "|".join(
+            [
+                self.config.get("model_name", ""),
+                self.tags_naming_scheme,
+                self.categories_naming_scheme,
+                self.folder_naming_scheme,
+            ]
+        )
 
+    def _embed(self, texts: List[str]) -> List[List[float]]:
+        """Embed texts in batched requests."""
+        from llm_organizer.core.client import get_openai_client
+
+        client = get_openai_client(self.config["openai_api_key"])
+        embeddings = []
+        for start in range(0, len(texts), EMBEDDING_BATCH_SIZE):
+            end = start + EMBEDDING_BATCH_SIZE
+            response = client.embeddings.create(
+                model=self.embedding_model, input=texts[start:end]
+            )
+            embeddings.extend(
+                item.embedding for item in sorted(response.data, key=lambda d: d.index)
+            )
+        return embeddings
+
+    def _from_cached_analysis(self, metadata: Dict, cached: Dict) -> Dict:
+        """Build an analysis result for a file from a cached analysis."""
+        return {
+            "path": metadata["path"],
+            "tags": cached["tags"],
+            "suggested_folder": cached["suggested_folder"],
+            "description": cached["description"],
+            "category": self._format_category(metadata.get("category", "Other")),
+        }
+
+    def _analyze_batch(self, files_to_analyze: List[Dict]) -> List[Dict]:
+        """
+        Analyze files through the OpenAI Batch API.
+
+        Batch requests are billed at a lower rate and are not subject to the
+        online rate limits, but may take up to 24 hours to complete.
+
+        Args:
+            files_to_analyze (List[Dict]): Metadata of the files that need analysis
+
+        Returns:
+            List[Dict]: Analysis results in the same order as the input
+        """
+        from llm_organizer.core.client import get_openai_client
+
+        client = get_openai_client(self.config["openai_api_key"])
+        lines = [
+            build_batch_line(
+                f"file-{i}", self._request_body(self._build_messages(metadata))
+            )
+            for i, metadata in enumerate(files_to_analyze)
+        ]
+
+        print(f"\n📦 Submitting {len(lines)} files to the OpenAI Batch API...")
+        responses = run_batch(client, lines, poll_interval=self.batch_poll_interval)
+
+        results = []
+        # Errors are reported together in a single write
+        errors = []
+        for i, metadata in enumerate(files_to_analyze):
+            try:
+                results.append(self._build_analysis(metadata, responses[f"file-{i}"]))
             except Exception as e:
-                print(f"Error analyzing {metadata['path']}: {str(e)}")
-                # Add a basic analysis result for failed files
-                results.append(
-                    {
-                        "path": metadata["path"],
-                        "tags": ["unclassified"],
-                        "suggested_folder": "other",
-                        "description": "Could not analyze file content",
-                        "category": metadata.get("category", "Other"),
-                    }
+                errors.append(f"Error analyzing {metadata['path']}: {e}")
+                results.append(self._fallback_analysis(metadata))
+
+        if errors:
+            print("\n".join(errors))
+        return results
+
+    async def _analyze_async(
+        self,
+        files_to_analyze: List[Dict],
+        on_result: Optional[Callable[[Dict], None]] = None,
+    ) -> List[Dict]:
+        """
+        Analyze files concurrently, bounded by the configured rate limits.
+
+        Args:
+            files_to_analyze (List[Dict]): Metadata of the files that need analysis
+            on_result: Optional callback receiving each result as it completes
+
+        Returns:
+            List[Dict]: Analysis results in the same order as the input
+        """
+        from tqdm import tqdm
+
+        from llm_organizer.core.client import create_async_openai_client
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        limiter = RateLimiter(self.max_requests_per_minute, self.max_tokens_per_minute)
+        # Errors are reported after the run so output doesn't slow the requests
+        errors = []
+
+        async with create_async_openai_client(
+            self.config["openai_api_key"], max_retries=0
+        ) as client:
+            with tqdm(
+                total=len(files_to_analyze),
+                desc="Analyzing files",
+                mininterval=PROGRESS_MIN_INTERVAL,
+            ) as progress:
+
+                async def analyze(metadata: Dict) -> Dict:
+                    try:
+                        analysis = await self._analyze_one(
+                            client, semaphore, limiter, metadata
+                        )
+                    except Exception as e:
+                        errors.append(f"Error analyzing {metadata['path']}: {e}")
+                        analysis = self._fallback_analysis(metadata)
+                    if on_result:
+                        on_result(analysis)
+                    progress.update(1)
+                    return analysis
+
+                results = await asyncio.gather(
+                    *(analyze(metadata) for metadata in files_to_analyze)
                 )
 
+        if errors:
+            print("\n".join(errors))
         return results
 
+    async def _analyze_one(
+        self,
+        client: "openai.AsyncOpenAI",
+        semaphore: asyncio.Semaphore,
+        limiter: "RateLimiter",
+        metadata: Dict,
+    ) -> Dict:
+        """Analyze a single file with one structured JSON request."""
+        messages = self._build_messages(metadata)
+        response_text = await self._complete(client, semaphore, limiter, messages)
+        return self._build_analysis(metadata, response_text)
+
+    def _build_messages(self, metadata: Dict) -> List[Dict]:
+        """Build the chat messages asking for a file's analysis."""
+        doc_text = self._prepare_document_text(metadata)
+        return [
+            {"role": "system", "content": ANALYSIS_SYSTEM_PROMPT},
+            {"role": "user", "content": f"{doc_text}\n\n{ANALYSIS_PROMPT}"},
+        ]
+
+    def _request_body(self, messages: List[Dict]) -> Dict:
+        """Build the chat completion request body for an analysis."""
+        return {
+            "model": self.config["model_name"],
+            "messages": messages,
+            "max_tokens": self.max_completion_tokens,
+            "response_format": {"type": "json_object"},
+        }
+
+    def _fallback_analysis(self, metadata: Dict) -> Dict:
+        """Build a basic analysis result for a file that could not be analyzed."""
+        return {
+            "path": metadata["path"],
+            "tags": ["unclassified"],
+            "suggested_folder": "other",
+            "description": FALLBACK_DESCRIPTION,
+            "category": metadata.get("category", "Other"),
+        }
+
+    def _build_analysis(self, metadata: Dict, response_text: str) -> Dict:
+        """
+        Convert the model's JSON answer into an analysis result.
+
+        Args:
+            metadata (Dict): Metadata of the analyzed file
+            response_text (str): JSON object returned by the model
+
+        Returns:
+            Dict: Analysis result with formatted tags, folder and category
+        """
+        data = self._parse_json_response(response_text)
+
+        # Parse and format tags according to naming scheme
+        tags = data.get("tags") or []
+        if isinstance(tags, str):
+            tags = self._parse_tags_response(tags)
+        formatted_tags = [self._format_tag(tag) for tag in tags if isinstance(tag, str)]
+
+        # Format folder name according to naming scheme
+        suggested_folder = self._format_folder(
+            str(data.get("suggested_folder") or "other").strip()
+        )
+
+        # Get category from metadata or use a default
+        category = metadata.get("category", "Other")
+        formatted_category = self._format_category(category)
+
+        return {
+            "path": metadata["path"],
+            "tags": formatted_tags or ["unclassified"],
+            "suggested_folder": suggested_folder,
+            "description": str(data.get("description") or "").strip(),
+            "category": formatted_category,
+        }
+
+    @staticmethod
+    def _parse_json_response(response_text: str) -> Dict:
+        """
+        Parse the JSON object of a model answer.
+
+        Args:
+            response_text (str): Model answer, ideally a bare JSON object
+
+        Returns:
+            Dict: Parsed object
+
+        Raises:
+            json.JSONDecodeError: If the answer contains no valid JSON object
+        """
+        try:
+            return fast_json.loads(response_text)
+        except json.JSONDecodeError:
+            # Some models wrap the object in prose or a code fence
+            match = JSON_OBJECT_RE.search(response_text)
+            if not match:
+                raise
+            return fast_json.loads(match.group(0))
+
+    async def _complete(
+        self,
+        client: "openai.AsyncOpenAI",
+        semaphore: asyncio.Semaphore,
+        limiter: "RateLimiter",
+        messages: List[Dict],
+    ) -> str:
+        """
+        Send a JSON-mode chat request, retrying transient API errors.
+
+        Args:
+            client (AsyncOpenAI): Client used for the request
+            semaphore (asyncio.Semaphore): Bounds the number of in-flight requests
+            limiter (RateLimiter): Throttle for requests and tokens per minute
+            messages (List[Dict]): Chat messages to send
+
+        Returns:
+            str: JSON text of the model's answer
+        """
+        import openai
+
+        # Errors worth retrying with backoff; anything else fails the request
+        retryable_errors = (
+            openai.RateLimitError,
+            openai.APIConnectionError,
+            openai.InternalServerError,
+        )
+
+        # Rough token estimate (~4 characters per token) plus the completion budget
+        estimated_tokens = (
+            sum(len(message["content"]) for message in messages) // 4
+            + self.max_completion_tokens
+        )
+
+        for attempt in range(1, self.max_attempts + 1):
+            await limiter.acquire(estimated_tokens)
+            try:
+                async with semaphore:
+                    response = await client.chat.completions.create(
+                        **self._request_body(messages)
+                    )
+                return response.choices[0].message.content or "{}"
+            except retryable_errors:
+                if attempt == self.max_attempts:
+                    raise
+                # Full jitter keeps concurrent retries from hitting the API together
+                delay = self.retry_base_delay * 2 ** (attempt - 1)
+                await asyncio.sleep(random.uniform(0, delay))
+
+        return "{}"
+
     def _prepare_document_text(self, metadata: Dict) -> str:
         """Prepare text for document creation from metadata."""
         parts = [
@@ -257,8 +812,8 @@ class FileIndexer:
 
         if metadata["content"]:
             parts.append("\nContent preview:")
-            # Limit content to avoid token limits
-            parts.append(metadata["content"][:2000])
+            # The scanner already limits content to CONTENT_PREVIEW_CHARS
+            parts.append(metadata["content"])
 
         return "\n".join(parts)
 
@@ -266,17 +821,15 @@ class FileIndexer:
         """Parse LLM response to extract tags."""
         try:
             # Try to extract JSON array from the response
-            json_match = re.search(r"\[(.*?)\]", response.replace("\n", ""))
+            json_match = TAGS_ARRAY_RE.search(response)
             if json_match:
                 try:
                     # Try to parse the extracted JSON
-                    tags_list = json.loads(f"[{json_match.group(1)}]")
+                    tags_list = fast_json.loads(f"[{json_match.group(1)}]")
                     if isinstance(tags_list, list):
                         # Filter out non-string items and cleanup
                         return [
-                            str(tag).strip()
-                            for tag in tags_list
-                            if isinstance(tag, str)
+                            tag.strip() for tag in tags_list if isinstance(tag, str)
                         ]
                 except json.JSONDecodeError:
                     pass
@@ -1,17 +1,311 @@
 """File organization module."""
 
+import asyncio
+import glob
+import hashlib
 import json
 import os
+import re
 import shutil
+import tempfile
+import time
+from collections import Counter, defaultdict
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, Iterator, List, Optional, Set, Tuple, Union
 
 from rich.console import Console
 from rich.table import Table
 
+from llm_organizer.utils import fast_json
+
 console = Console()
 
+# Folder inside the organized directory holding the organizer's own files
+APP_DATA_FOLDER_NAME = ".llm_organizer"
+
+# Folder in the app data folder holding schemas by request hash
+SCHEMA_CACHE_DIR = "schema_cache"
+
+# Generated files that migrate_organizer_files moves into the app data folder
+ORGANIZER_FILE_PATTERNS = (
+    "organization_plan_*.html",
+    "organization_schema_*.json",
+    "file_organization_toc_*.json",
+)
+
+# System message of the intelligent organization request
+SCHEMA_SYSTEM_PROMPT = (
+    "You are an expert file organizer that outputs valid JSON. Your goal is to "
+    "create logical folder structures based on file content, tags, and categories."
+)
+
+# Instructions of the intelligent organization request; the files to organize
+# are appended as JSON. Keeping everything that doesn't change between runs
+# in front lets OpenAI serve it from its prompt cache.
+SCHEMA_INSTRUCTIONS = """
+You are an expert file organizer. Given a list of files with their tags, descriptions, and categories,
+create a logical folder structure that groups related files together.
+
+Consider the following guidelines:
+1. Create main categories based on file types, topics, or project areas
+2. Create appropriate subcategories where relevant
+3. Use descriptive, clear folder names (don't worry about formatting - just use spaces and readable names)
+4. Consider hierarchical relationships between files
+5. Maximum folder depth should be 3 levels (including the base directory)
+6. Group files by interest areas and themes, not just file types
+7. Create general purpose folders that can accommodate multiple related files
+8. Use the category field as a starting point, but feel free to create more appropriate organization
+9. Pay special attention to media files like images, videos, and audio - try to keep them organized by content rather than just file type
+10. Avoid using "Other" as a folder name unless absolutely necessary - try to find meaningful groupings
+11. For images, consider grouping them by theme, subject matter, or purpose rather than putting all in a generic "Images" folder
+
+Return your answer as a JSON object with the following structure:
+{
+  "folder_hierarchy": [
+    {
+      "name": "Folder Name",
+      "path": "Folder Name",
+      "parent": null,
+      "children": [
+        {
+          "name": "Subfolder Name",
+          "path": "Folder Name/Subfolder Name",
+          "parent": "Folder Name",
+          "children": []
+        }
+      ]
+    }
+  ],
+  "file_mappings": {
+    "original/path/to/file.txt": "Folder Name/Subfolder Name"
+  }
+}
+
+Note: Don't worry about the formatting style of folder names (like camelCase or snake_case) - just use clear, descriptive names.
+The formatting will be handled automatically by the system based on user preferences.
+
+Here are the files to organize:
+"""
+
+# Extensions of image files, which are kept together when otherwise unsorted
+IMAGE_EXTENSIONS = frozenset({".jpg", ".jpeg", ".png", ".gif", ".bmp", ".svg", ".webp"})
+
+# Words of folder names, tags, filenames and descriptions; camelCase words
+# are split further at their capitals
+WORD_RE = re.compile(r"[^\W_]+")
+CAMEL_CASE_BOUNDARY_RE = re.compile(r"(?<=[a-z0-9])(?=[A-Z])")
+
+# Translation table replacing characters that are invalid in folder names
+INVALID_FOLDER_CHARS = str.maketrans({char: "_" for char in '<>:"/\\|?*'})
+
+# Translation table escaping the characters that are special in HTML text and
+# attribute values, applied in one pass over each value put into the report
+HTML_ESCAPES = str.maketrans(
+    {"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;", "'": "&#x27;"}
+)
+
+# HTML report, written in parts so rows can be streamed to the file.
+# Head and summary, up to the folder list items:
+REPORT_HEAD_TEMPLATE = """
+<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Directory Organization Plan</title>
+    <style>
+        body {{
+            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Oxygen, Ubuntu, Cantarell, 'Open Sans', 'Helvetica Neue', sans-serif;
+            line-height: 1.6;
+            color: #333;
+            max-width: 1200px;
+            margin: 0 auto;
+            padding:.2rem;
+        }}
+        h1, h2, h3 {{
+            color: #2c3e50;
+        }}
+        .header {{
+            background-color: #f8f9fa;
+            padding: 1rem;
+            border-radius: 5px;
+            margin-bottom: 2rem;
+            border-left: 5px solid #6c5ce7;
+        }}
+        .summary {{
+            display: flex;
+            flex-wrap: wrap;
+            gap: 1rem;
+            margin-bottom: 2rem;
+        }}
+        .summary-item {{
+            flex: 1;
+            min-width: 200px;
+            background-color: #f1f2f6;
+            padding: 1rem;
+            border-radius: 5px;
+            box-shadow: 0 2px 5px rgba(0,0,0,0.1);
+        }}
+        table {{
+            width: 100%;
+            border-collapse: collapse;
+            margin-bottom: 2rem;
+            box-shadow: 0 2px 15px rgba(0,0,0,0.1);
+        }}
+        th, td {{
+            padding: 12px 15px;
+            text-align: left;
+            border-bottom: 1px solid #ddd;
+        }}
+        th {{
+            background-color: #6c5ce7;
+            color: white;
+            position: sticky;
+            top: 0;
+        }}
+        tr:nth-child(even) {{
+            background-color: #f8f9fa;
+        }}
+        tr:hover {{
+            background-color: #f1f2f6;
+        }}
+        .tag {{
+            display: inline-block;
+            background-color: #e2e8f0;
+            color: #4a5568;
+            padding: 2px 8px;
+            margin: 2px;
+            border-radius: 12px;
+            font-size: 0.85em;
+        }}
+        .folders {{
+            background-color: #f1f2f6;
+            padding: 1rem;
+            border-radius: 5px;
+            margin-bottom: 2rem;
+        }}
+        .footer {{
+            text-align: center;
+            font-size: 0.9em;
+            color: #718096;
+            margin-top: 3rem;
+            padding-top: 1rem;
+            border-top: 1px solid #e2e8f0;
+        }}
+        @media print {{
+            th {{
+                background-color: #ddd !important;
+                color: black !important;
+            }}
+            .tag {{
+                border: 1px solid #ccc;
+            }}
+            table {{
+                box-shadow: none;
+            }}
+        }}
+    </style>
+</head>
+<body>
+    <div class="header">
+        <h1>Directory Organization Plan</h1>
+        <p>Generated on {date} for {directory}</p>
+    </div>
+
+    <div class="summary">
+        <div class="summary-item">
+            <h3>Files to Organize</h3>
+            <p style="font-size: 24px; font-weight: bold;">{file_count}</p>
+        </div>
+        <div class="summary-item">
+            <h3>New Folders</h3>
+            <p style="font-size: 24px; font-weight: bold;">{folder_count}</p>
+        </div>
+    </div>
+
+    <h2>New Folder Structure</h2>
+    <div class="folders">
+        <ul>
+"""
+
+# End of the folder list and start of the moves table:
+REPORT_TABLE_START = """        </ul>
+    </div>
+
+    <h2>File Organization Plan</h2>
+    <table>
+        <thead>
+            <tr>
+                <th>Original Location</th>
+                <th>New Location</th>
+                <th>Description</th>
+                <th>Tags</th>
+            </tr>
+        </thead>
+        <tbody>
+"""
+
+# One row of the moves table:
+REPORT_ROW_TEMPLATE = """            <tr>
+                <td>{source}</td>
+                <td>{destination}</td>
+                <td>{description}</td>
+                <td>{tags}</td>
+            </tr>
+"""
+
+# End of the table and document:
+REPORT_TAIL = """        </tbody>
+    </table>
+
+    <div class="footer">
+        <p>Generated by LLM Directory Organizer</p>
+    </div>
+</body>
+</html>
+"""
+
+
+def iter_folders(hierarchy: List[Dict]) -> Iterator[Dict]:
+    """
+    Walk a schema's folder hierarchy depth-first, parents before children.
+
+    Args:
+        hierarchy (List[Dict]): Top-level folder nodes with nested "children"
+
+    Yields:
+        Dict: Each folder node, in document order
+    """
+    stack = list(reversed(hierarchy))
+    while stack:
+        folder = stack.pop()
+        yield folder
+        stack.extend(reversed(folder.get("children") or ()))
+
+
+def split_words(text: str) -> Set[str]:
+    """
+    Get the distinct words of a name or text, as matched against folder names.
+
+    Words are lowercased, and a plural "s" is dropped so that e.g. "photos"
+    matches a "Photo" folder.
+
+    Args:
+        text (str): Folder name, tag, filename or description
+
+    Returns:
+        Set[str]: Normalized words
+    """
+    words = set()
+    for chunk in WORD_RE.findall(text):
+        for word in CAMEL_CASE_BOUNDARY_RE.split(chunk):
+            word = word.lower()
+            if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+                word = word[:-1]
+            words.add(word)
+    return words
+
 
 class FileOrganizer:
     """Handles file organization and TOC generation."""
@@ -27,6 +321,14 @@ class FileOrganizer:
             self.folder_naming_scheme = config.organizer.naming_scheme
             self.categories_naming_scheme = config.organizer.categories_naming_scheme
 
+        # Sanitized folder names by (suggested name, naming scheme); files
+        # mostly share a handful of suggested folders
+        self._sanitized_names: Dict[tuple, str] = {}
+
+        # base_dir as a string with a trailing separator, see _relative_path
+        self._base_str = None
+        self._base_prefix = None
+
     def generate_intelligent_schema(self, analysis_results: List[Dict]) -> Dict:
         """
         Generate an intelligent organization schema based on all files together.
@@ -40,7 +342,141 @@ class FileOrganizer:
         Returns:
             Dict: Organization schema with folder hierarchy and file mappings
         """
-        # Prepare a consolidated view of all files for the LLM
+        files_summary = self._summarize_files(analysis_results)
+
+        try:
+            # Import here to avoid circular imports
+            from llm_organizer.config.defaults import load_config
+            from llm_organizer.core.client import get_openai_client
+
+            config = self.config or load_config()
+            request_body, cache_key, cached_schema = self._prepare_schema_request(
+                files_summary, config
+            )
+            if cached_schema is not None:
+                return cached_schema
+
+            client = get_openai_client(config.llm.api_key)
+            response_content = None
+            if config.organizer.batch_mode:
+                response_content = self._request_schema_batch(client, request_body)
+            if response_content is None:
+                response = client.chat.completions.create(**request_body)
+                response_content = response.choices[0].message.content
+                self._report_cached_tokens(response.usage)
+
+            return self._finish_schema(
+                response_content, files_summary, cache_key, config
+            )
+
+        except Exception as e:
+            console.print(f"Error generating intelligent schema: {str(e)}", style="red")
+            # Fallback to a basic schema if the API call fails
+            return self._generate_fallback_schema(analysis_results)
+
+    async def aorganize_many(
+        self, result_batches: Dict[Union[str, Path], List[Dict]]
+    ) -> Dict[str, Dict]:
+        """
+        Generate intelligent organization plans for several directories at once.
+
+        The schema requests overlap, at most config.organizer.llm_concurrency
+        at a time, so organizing many directories takes about as long as the
+        slowest request instead of the sum of all of them.
+
+        Args:
+            result_batches (Dict): File analysis results by base directory
+
+        Returns:
+            Dict[str, Dict]: Organization plan of each base directory
+        """
+        from llm_organizer.config.defaults import load_config
+        from llm_organizer.core.client import create_async_openai_client
+
+        config = self.config or load_config()
+        semaphore = asyncio.Semaphore(config.organizer.llm_concurrency)
+
+        # Each directory gets its own organizer, as paths are resolved
+        # against the organizer's base directory
+        organizers = {}
+        for directory in result_batches:
+            organizer = FileOrganizer(config=self.config)
+            organizer.base_dir = Path(directory)
+            organizers[str(directory)] = organizer
+
+        async with create_async_openai_client(config.llm.api_key) as client:
+            schemas = await asyncio.gather(
+                *[
+                    organizers[str(directory)]._agenerate_intelligent_schema(
+                        results, client, semaphore, config
+                    )
+                    for directory, results in result_batches.items()
+                ]
+            )
+
+        return {
+            str(directory): organizers[str(directory)]._process_intelligent_schema(
+                schema, results
+            )
+            for (directory, results), schema in zip(result_batches.items(), schemas)
+        }
+
+    async def _agenerate_intelligent_schema(
+        self,
+        analysis_results: List[Dict],
+        client,
+        semaphore: asyncio.Semaphore,
+        config,
+    ) -> Dict:
+        """
+        Generate an intelligent organization schema without blocking the event loop.
+
+        Args:
+            analysis_results (List[Dict]): List of all file analysis results
+            client: Asynchronous OpenAI client
+            semaphore (asyncio.Semaphore): Bounds the number of in-flight requests
+            config (AppConfig): Configuration
+
+        Returns:
+            Dict: Organization schema with folder hierarchy and file mappings
+        """
+        files_summary = self._summarize_files(analysis_results)
+
+        try:
+            request_body, cache_key, cached_schema = self._prepare_schema_request(
+                files_summary, config
+            )
+            if cached_schema is not None:
+                return cached_schema
+
+            response_content = None
+            if config.organizer.batch_mode:
+                from llm_organizer.core.client import get_openai_client
+
+                # The Batch API helpers are synchronous; wait for them in a thread
+                response_content = await asyncio.get_running_loop().run_in_executor(
+                    None,
+                    self._request_schema_batch,
+                    get_openai_client(config.llm.api_key),
+                    request_body,
+                )
+            if response_content is None:
+                async with semaphore:
+                    response = await client.chat.completions.create(**request_body)
+                response_content = response.choices[0].message.content
+                self._report_cached_tokens(response.usage)
+
+            return self._finish_schema(
+                response_content, files_summary, cache_key, config
+            )
+
+        except Exception as e:
+            console.print(f"Error generating intelligent schema: {str(e)}", style="red")
+            # Fallback to a basic schema if the API call fails
+            return self._generate_fallback_schema(analysis_results)
+
+    def _summarize_files(self, analysis_results: List[Dict]) -> List[Dict]:
+        """Prepare a consolidated view of all files for the LLM."""
         files_summary = []
         for result in analysis_results:
             files_summary.append(
@@ -49,113 +485,190 @@ class FileOrganizer:
                     "tags": result["tags"],
                     "description": result["description"],
                     "category": result.get("category", "Other"),
-                    "current_path": str(
-                        Path(result["path"]).relative_to(self.base_dir)
-                    ),
+                    "current_path": self._relative_path(result["path"]),
                 }
             )
+        return files_summary
 
-        # Prepare prompt for the LLM - expanded to include category information
-        prompt = f"""
-You are an expert file organizer. Given the following list of files with their tags, descriptions, and categories,
-create a logical folder structure that groups related files together.
+    def _prepare_schema_request(
+        self, files_summary: List[Dict], config
+    ) -> Tuple[Dict, str, Optional[Dict]]:
+        """
+        Build the schema request and look up a cached answer to it.
 
-Consider the following guidelines:
-1. Create main categories based on file types, topics, or project areas
-2. Create appropriate subcategories where relevant
-3. Use descriptive, clear folder names (don't worry about formatting - just use spaces and readable names)
-4. Consider hierarchical relationships between files
-5. Maximum folder depth should be 3 levels (including the base directory)
-6. Group files by interest areas and themes, not just file types
-7. Create general purpose folders that can accommodate multiple related files
-8. Use the category field as a starting point, but feel free to create more appropriate organization
-9. Pay special attention to media files like images, videos, and audio - try to keep them organized by content rather than just file type
-10. Avoid using "Other" as a folder name unless absolutely necessary - try to find meaningful groupings
-11. For images, consider grouping them by theme, subject matter, or purpose rather than putting all in a generic "Images" folder
+        Args:
+            files_summary (List[Dict]): Files as prepared by _summarize_files
+            config (AppConfig): Configuration
 
-Here are the files to organize:
-{json.dumps(files_summary, indent=2)}
+        Returns:
+            Tuple: Request body, its cache key, and the cached schema if any
+        """
+        # Use GPT-4o specifically for organization planning
+        organization_model = config.llm.organization_model
 
-Return your answer as a JSON object with the following structure:
-{{
-  "folder_hierarchy": [
-    {{
-      "name": "Folder Name",
-      "path": "Folder Name",
-      "parent": null,
-      "children": [
-        {{
-          "name": "Subfolder Name",
-          "path": "Folder Name/Subfolder Name",
-          "parent": "Folder Name",
-          "children": []
-        }}
-      ]
-    }}
-  ],
-  "file_mappings": {{
-    "original/path/to/file.txt": "Folder Name/Subfolder Name"
-  }}
-}}
+        console.print(
+            f"\n🧠 Using {organization_model} for intelligent organization planning..."
+        )
 
-Note: Don't worry about the formatting style of folder names (like camelCase or snake_case) - just use clear, descriptive names.
-The formatting will be handled automatically by the system based on user preferences.
-"""
+        # The instructions come first and the files last, so the identical
+        # prefix of every request can be served from OpenAI's prompt cache.
+        # The files are sent as compact JSON; indentation only costs tokens.
+        files_json = fast_json.dumps(files_summary).decode("utf-8")
+        request_body = {
+            "model": organization_model,
+            "messages": [
+                {"role": "system", "content": SCHEMA_SYSTEM_PROMPT},
+                {
+                    "role": "user",
+                    "content": [
+                        {"type": "text", "text": SCHEMA_INSTRUCTIONS},
+                        {"type": "text", "text": files_json},
+                    ],
+                },
+            ],
+            "response_format": {"type": "json_object"},
+            "temperature": 0.2,
+        }
 
-        try:
-            # Import here to avoid circular imports
-            from openai import OpenAI
+        # A request for the same files, model and prompt reuses the answer
+        cache_key = hashlib.sha256(
+            json.dumps(request_body, sort_keys=True, separators=(",", ":")).encode(
+                "utf-8"
+            )
+        ).hexdigest()
+        cached_schema = self._load_cached_schema(
+            cache_key, config.organizer.schema_cache_ttl_hours
+        )
+        if cached_schema is not None:
+            console.print(
+                "\n♻️ Reusing the organization schema of an identical request",
+                style="blue",
+            )
+        return request_body, cache_key, cached_schema
 
-            from llm_organizer.config.defaults import load_config
+    def _finish_schema(
+        self, response_content: str, files_summary: List[Dict], cache_key: str, config
+    ) -> Dict:
+        """
+        Parse the schema answer, complete it, and cache and save it.
 
-            config = load_config()
-            api_key = config.llm.api_key
+        Args:
+            response_content (str): JSON answer of the schema request
+            files_summary (List[Dict]): Files as prepared by _summarize_files
+            cache_key (str): Cache key of the request
+            config (AppConfig): Configuration
 
-            # Use GPT-4o specifically for organization planning
-            organization_model = config.llm.organization_model
+        Returns:
+            Dict: Organization schema with folder hierarchy and file mappings
+        """
+        # Extract the JSON content from the response
+        schema = fast_json.loads(response_content)
+
+        # Ensure basic structure exists for safety
+        if "folder_hierarchy" not in schema:
+            schema["folder_hierarchy"] = []
+        if "file_mappings" not in schema:
+            schema["file_mappings"] = {}
+
+        # If no file mappings were created, add fallback logic to assign files to folders
+        if not schema["file_mappings"] and schema["folder_hierarchy"]:
+            # Assign files based on tags and folder names
+            self._assign_files_to_folders(schema, files_summary)
+
+        # Save the schema for future reference
+        if config.organizer.schema_cache_ttl_hours > 0:
+            self._cache_schema(cache_key, schema)
+        self._save_schema(schema)
+
+        return schema
+
+    def _report_cached_tokens(self, usage) -> None:
+        """Print how much of the prompt was served from OpenAI's prompt cache."""
+        details = getattr(usage, "prompt_tokens_details", None)
+        cached_tokens = getattr(details, "cached_tokens", None)
+        if cached_tokens is None:
+            return
+        console.print(
+            f"Prompt tokens: {usage.prompt_tokens} ({cached_tokens} cached)",
+            style="dim",
+        )
+
+    def _request_schema_batch(self, client, request_body: Dict) -> Optional[str]:
+        """
+        Request an organization schema through the OpenAI Batch API.
+
+        Args:
+            client: Synchronous OpenAI client
+            request_body (Dict): Chat completion request body
+
+        Returns:
+            Optional[str]: JSON answer, or None if the batch failed and the
+                schema should be requested directly
+        """
+        from llm_organizer.core.batch import BatchQueue
 
+        # The directory identifies the request within the batch
+        custom_id = (
+            "schema-"
+            + hashlib.sha256(str(self.base_dir).encode("utf-8")).hexdigest()[:16]
+        )
+        queue = BatchQueue()
+        queue.add(custom_id, request_body)
+
+        console.print("\n📦 Submitting organization request to the OpenAI Batch API...")
+        try:
+            return queue.run(client).get(custom_id)
+        except Exception as e:
             console.print(
-                f"\n🧠 Using {organization_model} for intelligent organization planning..."
+                f"Batch request failed, requesting directly instead: {e}",
+                style="yellow",
             )
+            return None
 
-            client = OpenAI(api_key=api_key)
-            response = client.chat.completions.create(
-                model=organization_model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are an expert file organizer that outputs valid JSON. Your goal is to create logical folder structures based on file content, tags, and categories.",
-                    },
-                    {"role": "user", "content": prompt},
-                ],
-                response_format={"type": "json_object"},
-                temperature=0.2,
-            )
+    def _load_cached_schema(self, key: str, ttl_hours: float) -> Optional[Dict]:
+        """
+        Get the schema cached for a request, if it is younger than ttl_hours.
 
-            # Extract the JSON content from the response
-            response_content = response.choices[0].message.content
-            schema = json.loads(response_content)
+        Args:
+            key (str): Hash of the schema request
+            ttl_hours (float): Maximum age of a usable entry in hours
 
-            # Ensure basic structure exists for safety
-            if "folder_hierarchy" not in schema:
-                schema["folder_hierarchy"] = []
-            if "file_mappings" not in schema:
-                schema["file_mappings"] = {}
+        Returns:
+            Optional[Dict]: Cached schema, or None if missing, stale or disabled
+        """
+        if ttl_hours <= 0:
+            return None
 
-            # If no file mappings were created, add fallback logic to assign files to folders
-            if not schema["file_mappings"] and schema["folder_hierarchy"]:
-                # Assign files based on tags and folder names
-                self._assign_files_to_folders(schema, files_summary)
+        cache_path = self._get_app_data_folder() / SCHEMA_CACHE_DIR / f"{key}.json"
+        try:
+            if time.time() - cache_path.stat().st_mtime > ttl_hours * 3600:
+                return None
+            return fast_json.loads(cache_path.read_bytes())
+        except (OSError, ValueError):
+            return None
 
-            # Save the schema for future reference
-            self._save_schema(schema)
+    def _cache_schema(self, key: str, schema: Dict) -> None:
+        """
+        Store the schema answering a request, see _load_cached_schema.
 
-            return schema
+        Args:
+            key (str): Hash of the schema request
+            schema (Dict): Schema to store
+        """
+        cache_dir = self._get_app_data_folder() / SCHEMA_CACHE_DIR
+        cache_dir.mkdir(exist_ok=True)
 
-        except Exception as e:
-            console.print(f"Error generating intelligent schema: {str(e)}", style="red")
-            # Fallback to a basic schema if the API call fails
-            return self._generate_fallback_schema(analysis_results)
+        # Written to a temporary file first, so readers never see a partial file
+        fd, temp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(fast_json.dumps(schema))
+            os.replace(temp_path, cache_dir / f"{key}.json")
+        except OSError as e:
+            console.print(
+                f"Could not cache the organization schema: {e}", style="yellow"
+            )
+            Path(temp_path).unlink(missing_ok=True)
 
     def _save_schema(self, schema: Dict) -> None:
         """Save the organization schema to a file for future reference."""
@@ -163,8 +676,7 @@ The formatting will be handled automatically by the system based on user prefere
         app_data_dir = self._get_app_data_folder()
         schema_path = app_data_dir / f"organization_schema_{timestamp}.json"
 
-        with open(schema_path, "w", encoding="utf-8") as f:
-            json.dump(schema, f, indent=2, ensure_ascii=False)
+        schema_path.write_bytes(fast_json.dumps(schema, indent=True))
         console.print(f"\n💾 Organization schema saved to: {schema_path}", style="blue")
 
     def _generate_fallback_schema(self, analysis_results: List[Dict]) -> Dict:
@@ -179,7 +691,7 @@ The formatting will be handled automatically by the system based on user prefere
                 if primary_tag not in tag_groups:
                     tag_groups[primary_tag] = []
 
-                rel_path = str(Path(result["path"]).relative_to(self.base_dir))
+                rel_path = self._relative_path(result["path"])
                 tag_groups[primary_tag].append(rel_path)
 
         # Generate a folder hierarchy and file mappings
@@ -206,20 +718,17 @@ The formatting will be handled automatically by the system based on user prefere
         """
         Assign files to appropriate folders when LLM doesn't provide mappings.
 
+        Files are matched to folders by the words their tags, filename and
+        description share with the folder names (see split_words).
+
         Args:
             schema: The folder schema with hierarchy but no mappings
             files_summary: The list of file metadata
         """
         # Extract all available folder paths
-        available_folders = []
-
-        def extract_paths(folders):
-            for folder in folders:
-                available_folders.append(folder["path"])
-                if folder["children"]:
-                    extract_paths(folder["children"])
-
-        extract_paths(schema["folder_hierarchy"])
+        available_folders = [
+            folder["path"] for folder in iter_folders(schema["folder_hierarchy"])
+        ]
 
         from llm_organizer.utils import format_naming_scheme
 
@@ -262,27 +771,30 @@ The formatting will be handled automatically by the system based on user prefere
                 )
                 available_folders.append(images_folder_name)
 
+        # Inverted index from each word of the folder names to the indexes of
+        # the folders with that word in their path, once per folder name using
+        # it; parent folders' names repeat in the paths of all their
+        # subfolders. A category matches whole folder names.
+        word_folders: Dict[str, List[int]] = defaultdict(list)
+        category_folders: Dict[str, List[int]] = defaultdict(list)
+        for index, folder_path in enumerate(available_folders):
+            folder_parts = folder_path.split("/")
+            for part in folder_parts:
+                for word in split_words(part):
+                    word_folders[word].append(index)
+            for part in set(folder_parts):
+                category_folders[part.lower()].append(index)
+
         # For each file, find the most appropriate folder
         for file_info in files_summary:
             best_folder = None
             best_score = -1
 
-            # Convert tags to lowercase for comparison
-            file_tags = [tag.lower() for tag in file_info["tags"]]
             filename_lower = file_info["filename"].lower()
             category = file_info.get("category", "").lower()
 
             # Special case for images
-            image_extensions = [
-                ".jpg",
-                ".jpeg",
-                ".png",
-                ".gif",
-                ".bmp",
-                ".svg",
-                ".webp",
-            ]
-            is_image = any(filename_lower.endswith(ext) for ext in image_extensions)
+            is_image = os.path.splitext(filename_lower)[1] in IMAGE_EXTENSIONS
 
             if (
                 is_image
@@ -292,37 +804,28 @@ The formatting will be handled automatically by the system based on user prefere
                 schema["file_mappings"][file_info["current_path"]] = images_folder_name
                 continue
 
-            for folder_path in available_folders:
-                folder_parts = folder_path.lower().split("/")
-                score = 0
-
-                # Special case for matching category to folder name
-                if category and any(
-                    part.lower() == category.lower() for part in folder_parts
-                ):
-                    score += 5  # Higher score for direct category match
-
-                # Check if any folder part matches file tags
-                for part in folder_parts:
-                    # Score based on folder name matching tags
-                    for tag in file_tags:
-                        if part in tag or tag in part:
-                            score += 2
-
-                    # Score based on folder name appearing in description
-                    if (
-                        "description" in file_info
-                        and part in file_info["description"].lower()
-                    ):
-                        score += 1
-
-                    # Score based on folder name appearing in filename
-                    if part in filename_lower:
-                        score += 3
-
-                if score > best_score:
-                    best_score = score
-                    best_folder = folder_path
+            # Only the folders sharing a word with the file's tags (2 points
+            # per tag), filename (3) or description (1) are looked up and scored
+            scores: Counter = Counter()
+            weighted_words = [(2, split_words(tag)) for tag in file_info["tags"]]
+            weighted_words.append((3, split_words(file_info["filename"])))
+            weighted_words.append((1, split_words(file_info.get("description", ""))))
+            for weight, words in weighted_words:
+                for word in words:
+                    for index in word_folders.get(word, ()):
+                        scores[index] += weight
+
+            # Special case for matching category to folder name
+            if category:
+                for index in category_folders.get(category, ()):
+                    scores[index] += 5  # Higher score for direct category match
+
+            # The first folder with the highest score wins
+            if scores:
+                best_score = max(scores.values())
+                best_folder = available_folders[
+                    min(index for index, score in scores.items() if score == best_score)
+                ]
 
             # Assign file to the best matching folder, or formatted "Other" if no match
             if best_score > 0:
@@ -343,7 +846,7 @@ The formatting will be handled automatically by the system based on user prefere
         Returns:
             Dict: Organization plan with moves, folders, and TOC entries
         """
-        plan = {"moves": [], "folders": set(), "toc_entries": []}
+        plan = {"moves": [], "folders": {}, "toc_entries": []}
 
         # Apply naming scheme to folder paths in schema
         from llm_organizer.utils import format_naming_scheme
@@ -351,27 +854,22 @@ The formatting will be handled automatically by the system based on user prefere
         # Create a mapping of original paths to formatted paths
         formatted_paths = {}
 
-        # Format folder paths in hierarchy
-        def format_paths(folders):
-            for folder in folders:
-                # Format each part of the path
-                path_parts = folder["path"].split("/")
-                formatted_parts = [
-                    format_naming_scheme(part, self.folder_naming_scheme)
-                    for part in path_parts
-                ]
-                formatted_path = "/".join(formatted_parts)
-
-                # Update the folder object
-                formatted_paths[folder["path"]] = formatted_path
-                folder["formatted_path"] = formatted_path
+        # Format all paths in the hierarchy and create their folders, in one pass
+        for folder in iter_folders(schema["folder_hierarchy"]):
+            # Format each part of the path
+            path_parts = folder["path"].split("/")
+            formatted_parts = [
+                format_naming_scheme(part, self.folder_naming_scheme)
+                for part in path_parts
+            ]
+            formatted_path = "/".join(formatted_parts)
 
-                # Process children recursively
-                if folder["children"]:
-                    format_paths(folder["children"])
+            # Update the folder object
+            formatted_paths[folder["path"]] = formatted_path
+            folder["formatted_path"] = formatted_path
 
-        # Format all paths in the hierarchy
-        format_paths(schema["folder_hierarchy"])
+            # Add this folder to the plan
+            plan["folders"][str(self.base_dir / formatted_path)] = None
 
         # Update file mappings to use formatted paths
         formatted_mappings = {}
@@ -381,28 +879,21 @@ The formatting will be handled automatically by the system based on user prefere
 
         schema["file_mappings"] = formatted_mappings
 
-        # Create all folders from the hierarchy
-        self._process_folder_hierarchy(
-            schema["folder_hierarchy"], plan["folders"], use_formatted=True
-        )
-
         # Format the "Other" folder name according to the naming scheme
         other_folder_formatted = format_naming_scheme(
             "Other", self.folder_naming_scheme
         )
+        other_folder_lower = other_folder_formatted.lower()
 
         # Ensure the "Other" folder exists if any files will be mapped there
         other_folder_needed = False
         for result in analysis_results:
-            original_path = Path(result["path"])
-            rel_path = str(original_path.relative_to(self.base_dir))
+            rel_path = self._relative_path(result["path"])
 
             # Check if any file will go to "Other" or "other"
             dest_folder = schema["file_mappings"].get(rel_path, other_folder_formatted)
-            if (
-                dest_folder.lower() == "other"
-                or dest_folder.lower() == other_folder_formatted.lower()
-            ):
+            dest_folder_lower = dest_folder.lower()
+            if dest_folder_lower == "other" or dest_folder_lower == other_folder_lower:
                 other_folder_needed = True
                 # Update the mapping to use the properly formatted name
                 schema["file_mappings"][rel_path] = other_folder_formatted
@@ -410,13 +901,12 @@ The formatting will be handled automatically by the system based on user prefere
 
         if other_folder_needed:
             other_folder = self.base_dir / other_folder_formatted
-            plan["folders"].add(str(other_folder))
+            plan["folders"][str(other_folder)] = None
 
         # Special handling for image files
         image_folder_formatted = format_naming_scheme(
             "Images", self.folder_naming_scheme
         )
-        image_extensions = [".jpg", ".jpeg", ".png", ".gif", ".bmp", ".svg", ".webp"]
 
         # Create an images folder if needed
         images_folder_needed = False
@@ -424,17 +914,17 @@ The formatting will be handled automatically by the system based on user prefere
         # Map each file to its destination
         for result in analysis_results:
             original_path = Path(result["path"])
-            rel_path = str(original_path.relative_to(self.base_dir))
+            rel_path = self._relative_path(result["path"])
 
             # Get destination folder from schema mapping or use default
             dest_folder = schema["file_mappings"].get(rel_path, other_folder_formatted)
 
             # Apply special handling for image files
-            if original_path.suffix.lower() in image_extensions:
+            if original_path.suffix.lower() in IMAGE_EXTENSIONS:
                 # Check category from analysis results
                 if (
                     result.get("category", "").lower() == "images"
-                    and dest_folder.lower() == other_folder_formatted.lower()
+                    and dest_folder.lower() == other_folder_lower
                 ):
                     dest_folder = image_folder_formatted
                     images_folder_needed = True
@@ -443,11 +933,13 @@ The formatting will be handled automatically by the system based on user prefere
             new_folder = self.base_dir / dest_folder
             new_path = new_folder / original_path.name
 
-            # Add move operation
+            # Add move operation, with paths relative to base_dir for reports
             plan["moves"].append(
                 {
                     "source": str(original_path),
                     "destination": str(new_path),
+                    "source_rel": rel_path,
+                    "destination_rel": os.path.join(dest_folder, original_path.name),
                     "description": result["description"],
                     "tags": result["tags"],
                 }
@@ -466,36 +958,10 @@ The formatting will be handled automatically by the system based on user prefere
         # Add images folder if needed
         if images_folder_needed:
             images_folder = self.base_dir / image_folder_formatted
-            plan["folders"].add(str(images_folder))
+            plan["folders"][str(images_folder)] = None
 
         return plan
 
-    def _process_folder_hierarchy(
-        self, hierarchy: List[Dict], folder_set: set, use_formatted: bool = False
-    ) -> None:
-        """
-        Process the folder hierarchy and add all paths to the folder set.
-
-        Args:
-            hierarchy (List[Dict]): List of folder hierarchy nodes
-            folder_set (set): Set to populate with folder paths
-            use_formatted (bool): Whether to use formatted paths from the schema
-        """
-        for folder in hierarchy:
-            # Add this folder to the set
-            if use_formatted and "formatted_path" in folder:
-                folder_path = self.base_dir / folder["formatted_path"]
-            else:
-                folder_path = self.base_dir / folder["path"]
-
-            folder_set.add(str(folder_path))
-
-            # Process children recursively
-            if folder["children"]:
-                self._process_folder_hierarchy(
-                    folder["children"], folder_set, use_formatted
-                )
-
     def generate_plan(
         self, analysis_results: List[Dict], use_intelligent_schema: bool = False
     ) -> Dict:
@@ -513,7 +979,7 @@ The formatting will be handled automatically by the system based on user prefere
         if analysis_results and not self.base_dir:
             self.base_dir = Path(analysis_results[0]["path"]).parent
 
-        plan = {"moves": [], "folders": set(), "toc_entries": []}
+        plan = {"moves": [], "folders": {}, "toc_entries": []}
 
         # Use the new intelligent schema if requested
         if use_intelligent_schema:
@@ -528,16 +994,20 @@ The formatting will be handled automatically by the system based on user prefere
                 # Create folder path
                 folder_name = self._sanitize_folder_name(result["suggested_folder"])
                 new_folder = self.base_dir / folder_name
-                plan["folders"].add(str(new_folder))
+                plan["folders"][str(new_folder)] = None
 
                 # Generate new file path
                 new_path = new_folder / original_path.name
 
-                # Add move operation
+                # Add move operation, with paths relative to base_dir for reports
                 plan["moves"].append(
                     {
                         "source": str(original_path),
                         "destination": str(new_path),
+                        "source_rel": self._relative_path(result["path"]),
+                        "destination_rel": os.path.join(
+                            folder_name, original_path.name
+                        ),
                         "description": result["description"],
                         "tags": result["tags"],
                     }
@@ -570,8 +1040,8 @@ The formatting will be handled automatically by the system based on user prefere
 
         for move in plan["moves"]:
             table.add_row(
-                str(Path(move["source"]).relative_to(self.base_dir)),
-                str(Path(move["destination"]).relative_to(self.base_dir)),
+                move["source_rel"],
+                move["destination_rel"],
                 (
                     move["description"][:50] + "..."
                     if len(move["description"]) > 50
@@ -603,193 +1073,43 @@ The formatting will be handled automatically by the system based on user prefere
         app_data_dir = self._get_app_data_folder()
         report_path = app_data_dir / f"organization_plan_{timestamp}.html"
 
-        # Prepare the HTML conten
-        html_content = """
-        <!DOCTYPE html>
-        <html lang="en">
-        <head>
-            <meta charset="UTF-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            <title>Directory Organization Plan</title>
-            <style>
-                body {{
-                    font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Oxygen, Ubuntu, Cantarell, 'Open Sans', 'Helvetica Neue', sans-serif;
-                    line-height: 1.6;
-                    color: #333;
-                    max-width: 1200px;
-                    margin: 0 auto;
-                    padding:.2rem;
-                }}
-                h1, h2, h3 {{
-                    color: #2c3e50;
-                }}
-                .header {{
-                    background-color: #f8f9fa;
-                    padding: 1rem;
-                    border-radius: 5px;
-                    margin-bottom: 2rem;
-                    border-left: 5px solid #6c5ce7;
-                }}
-                .summary {{
-                    display: flex;
-                    flex-wrap: wrap;
-                    gap: 1rem;
-                    margin-bottom: 2rem;
-                }}
-                .summary-item {{
-                    flex: 1;
-                    min-width: 200px;
-                    background-color: #f1f2f6;
-                    padding: 1rem;
-                    border-radius: 5px;
-                    box-shadow: 0 2px 5px rgba(0,0,0,0.1);
-                }}
-                table {{
-                    width: 100%;
-                    border-collapse: collapse;
-                    margin-bottom: 2rem;
-                    box-shadow: 0 2px 15px rgba(0,0,0,0.1);
-                }}
-                th, td {{
-                    padding: 12px 15px;
-                    text-align: left;
-                    border-bottom: 1px solid #ddd;
-                }}
-                th {{
-                    background-color: #6c5ce7;
-                    color: white;
-                    position: sticky;
-                    top: 0;
-                }}
-                tr:nth-child(even) {{
-                    background-color: #f8f9fa;
-                }}
-                tr:hover {{
-                    background-color: #f1f2f6;
-                }}
-                .tag {{
-                    display: inline-block;
-                    background-color: #e2e8f0;
-                    color: #4a5568;
-                    padding: 2px 8px;
-                    margin: 2px;
-                    border-radius: 12px;
-                    font-size: 0.85em;
-                }}
-                .folders {{
-                    background-color: #f1f2f6;
-                    padding: 1rem;
-                    border-radius: 5px;
-                    margin-bottom: 2rem;
-                }}
-                .footer {{
-                    text-align: center;
-                    font-size: 0.9em;
-                    color: #718096;
-                    margin-top: 3rem;
-                    padding-top: 1rem;
-                    border-top: 1px solid #e2e8f0;
-                }}
-                @media print {{
-                    th {{
-                        background-color: #ddd !important;
-                        color: black !important;
-                    }}
-                    .tag {{
-                        border: 1px solid #ccc;
-                    }}
-                    table {{
-                        box-shadow: none;
-                    }}
-                }}
-            </style>
-        </head>
-        <body>
-            <div class="header">
-                <h1>Directory Organization Plan</h1>
-                <p>Generated on {date} for {directory}</p>
-            </div>
-
-            <div class="summary">
-                <div class="summary-item">
-                    <h3>Files to Organize</h3>
-                    <p style="font-size: 24px; font-weight: bold;">{file_count}</p>
-                </div>
-                <div class="summary-item">
-                    <h3>New Folders</h3>
-                    <p style="font-size: 24px; font-weight: bold;">{folder_count}</p>
-                </div>
-            </div>
-
-            <h2>New Folder Structure</h2>
-            <div class="folders">
-                <ul>
-                    {folder_list}
-                </ul>
-            </div>
-
-            <h2>File Organization Plan</h2>
-            <table>
-                <thead>
-                    <tr>
-                        <th>Original Location</th>
-                        <th>New Location</th>
-                        <th>Description</th>
-                        <th>Tags</th>
-                    </tr>
-                </thead>
-                <tbody>
-                    {table_rows}
-                </tbody>
-            </table>
-
-            <div class="footer">
-                <p>Generated by LLM Directory Organizer</p>
-            </div>
-        </body>
-        </html>
-        """
-
-        # Generate table rows
-        table_rows = ""
-        for move in plan["moves"]:
-            source_rel = str(Path(move["source"]).relative_to(self.base_dir))
-            dest_rel = str(Path(move["destination"]).relative_to(self.base_dir))
-
-            # Generate tags with HTML styling
-            tags_html = ""
-            for tag in move["tags"]:
-                tags_html += f'<span class="tag">{tag}</span> '
+        with open(report_path, "w", encoding="utf-8", buffering=1 << 20) as f:
+            f.write(
+                REPORT_HEAD_TEMPLATE.format(
+                    date=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                    directory=str(self.base_dir).translate(HTML_ESCAPES),
+                    file_count=len(plan["moves"]),
+                    folder_count=len(plan["folders"]),
+                )
+            )
 
-            # Add row
-            table_rows += f"""
-            <tr>
-                <td>{source_rel}</td>
-                <td>{dest_rel}</td>
-                <td>{move['description']}</td>
-                <td>{tags_html}</td>
-            </tr>
-            """
-
-        # Generate folder lis
-        folder_list = ""
-        for folder in sorted(plan["folders"]):
-            folder_rel = str(Path(folder).relative_to(self.base_dir))
-            folder_list += f"<li>{folder_rel}</li>\n"
-
-        # Fill in template values
-        html_content = html_content.format(
-            date=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            directory=str(self.base_dir),
-            file_count=len(plan["moves"]),
-            folder_count=len(plan["folders"]),
-            folder_list=folder_list,
-            table_rows=table_rows,
-        )
+            # Folder list
+            for folder in plan["folders"]:
+                folder_rel = self._relative_path(folder)
+                folder_rel = folder_rel.translate(HTML_ESCAPES)
+                f.write(f"            <li>{folder_rel}</li>\n")
+
+            f.write(REPORT_TABLE_START)
+
+            # Table rows, written one at a time. Tags repeat across files, so
+            # each tag's markup is built once.
+            tag_markup = {}
+            for move in plan["moves"]:
+                for tag in move["tags"]:
+                    if tag not in tag_markup:
+                        escaped = tag.translate(HTML_ESCAPES)
+                        tag_markup[tag] = f'<span class="tag">{escaped}</span> '
+                tags_html = "".join([tag_markup[tag] for tag in move["tags"]])
+                f.write(
+                    REPORT_ROW_TEMPLATE.format(
+                        source=move["source_rel"].translate(HTML_ESCAPES),
+                        destination=move["destination_rel"].translate(HTML_ESCAPES),
+                        description=move["description"].translate(HTML_ESCAPES),
+                        tags=tags_html,
+                    )
+                )
 
-        # Write the HTML file
-        with open(report_path, "w", encoding="utf-8") as f:
-            f.write(html_content)
+            f.write(REPORT_TAIL)
 
         return str(report_path)
 
@@ -803,14 +1123,32 @@ The formatting will be handled automatically by the system based on user prefere
         Returns:
             List[Dict]: List of executed operations for logging
         """
-        operations = []
+        return list(self.iter_execute_plan(plan))
+
+    def iter_execute_plan(self, plan: Dict) -> Iterator[Dict]:
+        """
+        Execute the organization plan, yielding each operation once it is done.
+
+        Args:
+            plan (Dict): Organization plan to execute
 
-        # Create folders
-        for folder in plan["folders"]:
+        Yields:
+            Dict: Executed operation for logging
+        """
+        # Folders known to exist, so moves don't re-create them
+        known_folders = set()
+
+        # Create folders, parents before children. mkdir fails on existing
+        # folders, which replaces a separate exists() check.
+        for folder in sorted(plan["folders"], key=lambda f: (f.count(os.sep), f)):
             folder_path = Path(folder)
-            if not folder_path.exists():
-                folder_path.mkdir(parents=True, exist_ok=True)
-                operations.append({"type": "create_folder", "path": str(folder_path)})
+            try:
+                folder_path.mkdir(parents=True)
+            except FileExistsError:
+                pass
+            else:
+                yield {"type": "create_folder", "path": str(folder_path)}
+            known_folders.add(str(folder_path))
 
         # Move files
         for move in plan["moves"]:
@@ -818,20 +1156,19 @@ The formatting will be handled automatically by the system based on user prefere
             destination = Path(move["destination"])
 
             if source.exists():
-                # Create parent directory if it doesn't exis
-                destination.parent.mkdir(parents=True, exist_ok=True)
+                # Create parent directory if it doesn't exist yet
+                parent = str(destination.parent)
+                if parent not in known_folders:
+                    destination.parent.mkdir(parents=True, exist_ok=True)
+                    known_folders.add(parent)
 
                 # Move the file
                 shutil.move(str(source), str(destination))
-                operations.append(
-                    {
-                        "type": "move",
-                        "source": str(source),
-                        "destination": str(destination),
-                    }
-                )
-
-        return operations
+                yield {
+                    "type": "move",
+                    "source": str(source),
+                    "destination": str(destination),
+                }
 
     def generate_toc(self, plan: Dict) -> str:
         """
@@ -847,19 +1184,43 @@ The formatting will be handled automatically by the system based on user prefere
         app_data_dir = self._get_app_data_folder()
         toc_path = app_data_dir / f"file_organization_toc_{timestamp}.json"
 
-        toc_data = {
+        header = {
             "organization_date": self._get_iso_date(),
             "base_directory": str(self.base_dir),
-            "files": plan["toc_entries"],
         }
 
-        with open(toc_path, "w", encoding="utf-8") as f:
-            json.dump(toc_data, f, indent=2, ensure_ascii=False)
+        # Write the entries one at a time, in the layout json.dump(indent=2)
+        # would produce, instead of serializing the whole TOC in memory
+        with open(toc_path, "w", encoding="utf-8", buffering=1 << 20) as f:
+            f.write("{\n")
+            for key, value in header.items():
+                f.write(f'  "{key}": {json.dumps(value, ensure_ascii=False)},\n')
+
+            entries = plan["toc_entries"]
+            if not entries:
+                f.write('  "files": []\n}')
+                return str(toc_path)
+
+            f.write('  "files": [\n')
+            for i, entry in enumerate(entries):
+                if i:
+                    f.write(",\n")
+                entry_json = json.dumps(entry, indent=2, ensure_ascii=False)
+                f.write("    " + entry_json.replace("\n", "\n    "))
+            f.write("\n  ]\n}")
 
         return str(toc_path)
 
     def _sanitize_folder_name(self, name: str) -> str:
         """Sanitize folder name for filesystem compatibility."""
+        key = (name, self.folder_naming_scheme)
+        sanitized = self._sanitized_names.get(key)
+        if sanitized is None:
+            sanitized = self._sanitized_names[key] = self._compute_folder_name(name)
+        return sanitized
+
+    def _compute_folder_name(self, name: str) -> str:
+        """Format and sanitize a folder name, see _sanitize_folder_name."""
         # Format the name according to the naming scheme
         from llm_organizer.utils import format_naming_scheme
 
@@ -867,9 +1228,7 @@ The formatting will be handled automatically by the system based on user prefere
         name = format_naming_scheme(name, self.folder_naming_scheme)
 
         # Replace invalid characters with underscores
-        invalid_chars = '<>:"/\\|?*'
-        for char in invalid_chars:
-            name = name.replace(char, "_")
+        name = name.translate(INVALID_FOLDER_CHARS)
 
         # Remove leading/trailing spaces and periods
         name = name.strip(". ")
@@ -880,13 +1239,36 @@ The formatting will be handled automatically by the system based on user prefere
 
         return name
 
+    def _relative_path(self, path: str) -> str:
+        """
+        Get a path relative to the base directory.
+
+        Paths under the base directory are sliced after its string prefix,
+        without parsing either path.
+
+        Args:
+            path (str): Absolute path, usually of a file in the base directory
+
+        Returns:
+            str: Path relative to the base directory
+        """
+        base = str(self.base_dir)
+        if base != self._base_str:
+            self._base_str = base
+            self._base_prefix = base.rstrip(os.sep) + os.sep
+
+        if path.startswith(self._base_prefix):
+            start = len(self._base_prefix)
+            return path[start:]
+        return os.path.relpath(path, base)
+
     def _get_iso_date(self) -> str:
         """Get current date in ISO format."""
         return datetime.now().isoformat()
 
     def _get_app_data_folder(self) -> Path:
         """Get or create the application data folder within the base directory."""
-        app_data_dir = self.base_dir / ".llm_organizer"
+        app_data_dir = self.base_dir / APP_DATA_FOLDER_NAME
 
         # Create the folder if it doesn't exist
         if not app_data_dir.exists():
@@ -894,6 +1276,22 @@ The formatting will be handled automatically by the system based on user prefere
 
         return app_data_dir
 
+    def organizer_exclude_patterns(self) -> List[str]:
+        """
+        Get scanner exclusion patterns for the organizer's own files.
+
+        They cover the app data folder and the generated files that
+        migrate_organizer_files() moves into it, so a scan gives the same
+        files whether it runs before, during or after the migration.
+
+        Returns:
+            List[str]: Exclusion patterns for the base directory
+        """
+        base_dir = Path(glob.escape(str(self.base_dir)))
+        patterns = [str(base_dir / pattern) for pattern in ORGANIZER_FILE_PATTERNS]
+        patterns.append(f"{self.base_dir / APP_DATA_FOLDER_NAME}/*")
+        return patterns
+
     def migrate_organizer_files(self) -> Dict:
         """
         Migrate existing organizer-generated files to the app data folder.
@@ -908,13 +1306,6 @@ The formatting will be handled automatically by the system based on user prefere
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         app_data_dir = self._get_app_data_folder()
 
-        # File patterns to search for and migrate
-        patterns = [
-            "organization_plan_*.html",
-            "organization_schema_*.json",
-            "file_organization_toc_*.json",
-        ]
-
         migration_summary = {
             "success": True,
             "message": "Migration completed successfully",
@@ -923,7 +1314,7 @@ The formatting will be handled automatically by the system based on user prefere
         }
 
         # Search for files in base directory and migrate them
-        for pattern in patterns:
+        for pattern in ORGANIZER_FILE_PATTERNS:
             for file_path in self.base_dir.glob(pattern):
                 # Skip if the file is already in the app data folder
                 if app_data_dir in file_path.parents:
@@ -3,12 +3,21 @@
 import fnmatch
 import os
 import re
-from datetime import datetime
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional, Pattern
+from typing import Dict, Iterator, List, Optional, Pattern, Tuple
 
 from tqdm import tqdm
 
+from llm_organizer.models.metadata_cache import (
+    CACHE_FILE_NAME,
+    DEFAULT_MAX_ENTRIES,
+    MetadataCache,
+)
+
 # Conditionally import document processing libraries
 try:
     import magic
@@ -24,12 +33,25 @@ try:
 except ImportError:
     DOCX_AVAILABLE = False
 
+# PDFium extracts text much faster; PyPDF2 is the fallback
+try:
+    import pypdfium2 as pdfium
+
+    PDFIUM_AVAILABLE = True
+except ImportError:
+    PDFIUM_AVAILABLE = False
+
 try:
     import PyPDF2
 
-    PDF_AVAILABLE = True
+    PYPDF2_AVAILABLE = True
 except ImportError:
-    PDF_AVAILABLE = False
+    PYPDF2_AVAILABLE = False
+
+PDF_AVAILABLE = PDFIUM_AVAILABLE or PYPDF2_AVAILABLE
+
+# PDFium is not thread-safe; the scan threads take turns using it
+PDFIUM_LOCK = threading.Lock()
 
 # Try to import PIL for image metadata
 try:
@@ -39,6 +61,74 @@ try:
 except ImportError:
     PIL_AVAILABLE = False
 
+# Exclusion patterns of the form '*.ext' without other wildcards
+SUFFIX_PATTERN = re.compile(r"^\*\.[^*?\[\]/\\]+$")
+
+# Directory names that are never scanned
+COMMON_EXCLUDES = frozenset(
+    ["venv", "node_modules", ".git", "__pycache__", "dist", "build"]
+)
+
+# Only the start of a file's text is sent for analysis, so only that much is
+# read or extracted; metadata["content"] never holds more than this. UTF-8
+# characters take at most 4 bytes.
+CONTENT_PREVIEW_CHARS = 2000
+CONTENT_PREVIEW_BYTES = 4 * CONTENT_PREVIEW_CHARS
+
+# MIME types of extensions whose type doesn't need to be detected from content
+EXTENSION_MIME_TYPES = {
+    ".txt": "text/plain",
+    ".md": "text/markdown",
+    ".py": "text/x-python",
+    ".js": "application/javascript",
+    ".html": "text/html",
+    ".css": "text/css",
+    ".json": "application/json",
+    ".yaml": "application/x-yaml",
+    ".yml": "application/x-yaml",
+    ".csv": "text/csv",
+    ".xml": "application/xml",
+    ".pdf": "application/pdf",
+    ".docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".png": "image/png",
+    ".gif": "image/gif",
+    ".bmp": "image/bmp",
+    ".webp": "image/webp",
+    ".tiff": "image/tiff",
+    ".tif": "image/tiff",
+    ".svg": "image/svg+xml",
+    ".mp4": "video/mp4",
+    ".mov": "video/quicktime",
+    ".avi": "video/x-msvideo",
+    ".mkv": "video/x-matroska",
+    ".webm": "video/webm",
+    ".mp3": "audio/mpeg",
+    ".wav": "audio/wav",
+    ".ogg": "audio/ogg",
+    ".flac": "audio/flac",
+    ".m4a": "audio/mp4",
+    ".zip": "application/zip",
+    ".gz": "application/gzip",
+    ".tar": "application/x-tar",
+    ".7z": "application/x-7z-compressed",
+}
+
+# Default size limit for parsing PDF/DOCX text, see ScannerConfig
+DEFAULT_MAX_FILE_SIZE_MB = 10.0
+
+# File reads are I/O bound, so threads overlap them well despite the GIL
+DEFAULT_MAX_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# Files queued per worker while the directory walk runs ahead of processing
+PENDING_FILES_PER_WORKER = 4
+
+
+def _iso_timestamp(timestamp: float) -> str:
+    """Format a POSIX timestamp as a local ISO 8601 string, to the second."""
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(timestamp))
+
 
 class DirectoryScanner:
     """Handles directory scanning and metadata collection."""
@@ -78,6 +168,7 @@ class DirectoryScanner:
             and hasattr(config.scanner, "file_categories")
         ):
             self.file_categories = config.scanner.file_categories
+            self._category_by_extension = config.scanner.ext_to_category
         else:
             # Default categories if config not provided
             self.file_categories = {
@@ -111,6 +202,40 @@ class DirectoryScanner:
                 "Executables": [".exe", ".app", ".bat", ".sh", ".msi"],
                 "Other": [],
             }
+            self._category_by_extension = {
+                extension: category
+                for category, extensions in reversed(self.file_categories.items())
+                for extension in extensions
+            }
+
+        # Number of threads reading file metadata and content during a scan
+        self.max_workers = DEFAULT_MAX_WORKERS
+        # Documents larger than this are not parsed for their text
+        max_file_size_mb = DEFAULT_MAX_FILE_SIZE_MB
+        if config and hasattr(config, "scanner"):
+            self.max_workers = (
+                getattr(config.scanner, "max_workers", None) or DEFAULT_MAX_WORKERS
+            )
+            max_file_size_mb = getattr(
+                config.scanner, "max_file_size_mb", DEFAULT_MAX_FILE_SIZE_MB
+            )
+        self.max_file_size = int(max_file_size_mb * 1024 * 1024)
+
+        # Metadata of files unchanged since a previous scan is reused
+        self.metadata_cache = None
+        if config and getattr(
+            getattr(config, "scanner", None), "use_metadata_cache", False
+        ):
+            self.metadata_cache = MetadataCache(
+                str(config.cache_dir / CACHE_FILE_NAME),
+                max_entries=getattr(
+                    config.scanner, "metadata_cache_size", DEFAULT_MAX_ENTRIES
+                ),
+            )
+
+        # One libmagic handle per scan thread, so the magic database is loaded
+        # once per thread and lookups don't contend on a shared handle's lock
+        self._magic_local = threading.local()
 
         # Only add supported binary handlers if libraries are available
         if PDF_AVAILABLE:
@@ -118,48 +243,91 @@ class DirectoryScanner:
         if DOCX_AVAILABLE:
             self.supported_binary[".docx"] = self._extract_docx_text
 
+        # Extensions worth a libmagic lookup when the MIME type table doesn't
+        # know them: files whose content is read, and files without an
+        # extension. Others get the extension-based guess.
+        self._mime_interesting_exts = (
+            set(self.text_extensions) | set(self.supported_binary) | {""}
+        )
+
         self.exclude_patterns = exclude_patterns or []
-        self.compiled_patterns = self._compile_patterns(self.exclude_patterns)
+        self.exclude_suffixes, dir_patterns, other_patterns = self._split_patterns(
+            self.exclude_patterns
+        )
+        self.exclude_dir_regex = self._compile_patterns(dir_patterns)
+        self.exclude_regex = self._compile_patterns(other_patterns)
+
+    def _split_patterns(
+        self, patterns: List[str]
+    ) -> Tuple[Tuple[str, ...], List[str], List[str]]:
+        """
+        Group exclusion patterns by how they can be matched.
+
+        Plain '*.ext' patterns match as simple suffixes. Directory patterns
+        ('dir/*') exclude everything below a directory, so the walk decides
+        them once per directory instead of for every file in it.
 
-    def _compile_patterns(self, patterns: List[str]) -> List[Pattern]:
-        """Compile glob patterns to regex patterns."""
-        compiled = []
+        Returns:
+            Tuple: Suffixes, directory patterns and all other patterns
+        """
+        suffixes = []
+        dir_patterns = []
+        others = []
+        for pattern in patterns:
+            if SUFFIX_PATTERN.match(pattern):
+                suffixes.append(pattern[1:])
+            elif pattern.endswith("/*"):
+                dir_patterns.append(pattern)
+            else:
+                others.append(pattern)
+        return tuple(suffixes), dir_patterns, others
+
+    def _compile_patterns(self, patterns: List[str]) -> Optional[Pattern]:
+        """Compile glob patterns into a single regex matching any of them."""
+        regexes = []
         for pattern in patterns:
             # Check if it's a directory pattern (ending with /*)
             if pattern.endswith("/*"):
                 # Convert to a pattern that matches any file in the directory
                 dir_pattern = pattern[:-2]
-                regex_pattern = f"^.*{re.escape(dir_pattern)}(/|\\\\).*$"
-                compiled.append(re.compile(regex_pattern))
+                regexes.append(f"^.*{re.escape(dir_pattern)}(/|\\\\).*$")
             else:
                 # Convert glob pattern to regex pattern
-                regex_pattern = fnmatch.translate(pattern)
-                compiled.append(re.compile(regex_pattern))
-        return compiled
+                regexes.append(fnmatch.translate(pattern))
+
+        if not regexes:
+            return None
+        return re.compile("|".join(f"(?:{regex})" for regex in regexes))
 
     def _should_exclude(self, path: Path) -> bool:
         """Check if a path should be excluded based on patterns."""
         path_str = str(path)
-
-        # Check against all patterns
-        for pattern in self.compiled_patterns:
-            if pattern.match(path_str):
-                return True
+        if self.exclude_dir_regex and self.exclude_dir_regex.match(path_str):
+            return True
+        if self._matches_patterns(path_str):
+            return True
 
         # Check common directories to exclude
-        common_excludes = [
-            "venv",
-            "node_modules",
-            ".git",
-            "__pycache__",
-            "dist",
-            "build",
-        ]
-        for exclude in common_excludes:
-            if exclude in path_str.split(os.sep):
-                return True
-
-        return False
+        return not COMMON_EXCLUDES.isdisjoint(path_str.split(os.sep))
+
+    def _should_exclude_entry(self, path: Path, name: str) -> bool:
+        """
+        Check if a directory entry found during the walk should be excluded.
+
+        The walk never enters excluded directories, so only the entry's own
+        name has to be checked against the common excludes, and directory
+        patterns have already been checked for the directory it is in.
+        """
+        return name in COMMON_EXCLUDES or self._matches_patterns(str(path))
+
+    def _matches_patterns(self, path_str: str) -> bool:
+        """Check a path against the file exclusion patterns."""
+        # Extension patterns are checked with one C-level endswith call
+        if self.exclude_suffixes and path_str.endswith(self.exclude_suffixes):
+            return True
+
+        # Check against all other patterns at once
+        return bool(self.exclude_regex and self.exclude_regex.match(path_str))
 
     def scan_directory(self, directory: str, recursive: bool = True) -> List[Dict]:
         """
@@ -175,45 +343,111 @@ class DirectoryScanner:
         directory_path = Path(directory)
         self.files_metadata = []  # Reset file metadata
 
-        # Get all files in directory
-        if recursive:
-            all_files = []
-            # Use os.walk to be able to skip directories
-            for root, dirs, files in os.walk(directory_path):
-                root_path = Path(root)
-
-                # Remove excluded directories (modify dirs in-place to prevent recursion)
-                dirs[:] = [d for d in dirs if not self._should_exclude(root_path / d)]
-
-                # Add non-excluded files
-                for filename in files:
-                    file_path = root_path / filename
-                    if not self._should_exclude(
-                        file_path
-                    ) and not file_path.name.startswith("."):
-                        all_files.append(file_path)
-        else:
-            # For non-recursive, just get files in the top directory
-            all_files = [
-                f
-                for f in directory_path.glob("*")
-                if f.is_file()
-                and not self._should_exclude(f)
-                and not f.name.startswith(".")
-            ]
-
-        # Process files
-        for file_path in tqdm(all_files, desc="Scanning files"):
-            try:
-                metadata = self._get_file_metadata(file_path)
+        # Walk the directory lazily, with the stat results of the walk.
+        # Nothing below a commonly excluded directory is scanned.
+        all_files = iter(())
+        if COMMON_EXCLUDES.isdisjoint(str(directory_path).split(os.sep)):
+            all_files = self._walk_scandir(directory_path, recursive)
+
+        # Process files concurrently, keeping the results in directory order
+        with ThreadPoolExecutor(max_workers=max(1, self.max_workers)) as executor:
+            results = self._map_bounded(executor, all_files)
+            for metadata in tqdm(results, desc="Scanning files", unit=" files"):
                 if metadata:
                     self.files_metadata.append(metadata)
-            except Exception as e:
-                print(f"Error processing {file_path}: {str(e)}")
-                continue
+
+        if self.metadata_cache is not None:
+            self.metadata_cache.flush()
+            stats = self.metadata_cache.stats()
+            print(
+                f"📊 Reused metadata of {stats['hits']} unchanged files, "
+                f"read {stats['misses']} new or changed files"
+            )
 
         return self.files_metadata
 
+    def _walk_scandir(
+        self, directory: Path, recursive: bool
+    ) -> Iterator[Tuple[Path, os.stat_result]]:
+        """
+        Walk a directory with os.scandir, yielding files that aren't excluded.
+
+        The entry type comes from the directory listing and the stat result is
+        taken from the entry, so files aren't stat'ed again for their metadata.
+        Like os.walk, symlinked directories are not followed.
+
+        Args:
+            directory (Path): Directory to walk
+            recursive (bool): Whether to descend into subdirectories
+
+        Yields:
+            Tuple[Path, os.stat_result]: Path and stat result of each file
+        """
+        # A directory pattern matching the directory matches all its entries
+        if self.exclude_dir_regex and self.exclude_dir_regex.match(
+            str(directory) + os.sep
+        ):
+            return
+
+        subdirs = []
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    entry_path = directory / entry.name
+                    try:
+                        if entry.is_dir():
+                            if (
+                                recursive
+                                and not entry.is_symlink()
+                                and not self._should_exclude_entry(
+                                    entry_path, entry.name
+                                )
+                            ):
+                                subdirs.append(entry_path)
+                        elif (
+                            entry.is_file()
+                            and not entry.name.startswith(".")
+                            and not self._should_exclude_entry(entry_path, entry.name)
+                        ):
+                            yield entry_path, entry.stat()
+                    except OSError as e:
+                        print(f"Error processing {entry_path}: {str(e)}")
+        except OSError:
+            # Unreadable directory, skipped like os.walk does
+            return
+
+        # Files of a directory come before those of its subdirectories
+        for subdir in subdirs:
+            yield from self._walk_scandir(subdir, recursive)
+
+    def _map_bounded(
+        self, executor: ThreadPoolExecutor, files: Iterator[Tuple[Path, os.stat_result]]
+    ) -> Iterator[Optional[Dict]]:
+        """
+        Process files from the walk on the executor, in order.
+
+        Unlike executor.map, the walk is consumed only as results are taken,
+        so at most a few files per worker are pending at any time.
+        """
+        pending = deque()
+        max_pending = max(1, self.max_workers) * PENDING_FILES_PER_WORKER
+        for file in files:
+            pending.append(executor.submit(self._process_file, file))
+            if len(pending) >= max_pending:
+                yield pending.popleft().result()
+
+        while pending:
+            yield pending.popleft().result()
+
+    def _process_file(self, file: Tuple[Path, os.stat_result]) -> Optional[Dict]:
+        """Get a file's metadata, reporting errors instead of raising them."""
+        file_path, stats = file
+        try:
+            return self._get_file_metadata(file_path, stats)
+        except Exception as e:
+            print(f"Error processing {file_path}: {str(e)}")
+            return None
+
     def _get_file_category(self, extension: str) -> str:
         """
         Determine the category of a file based on its extension.
@@ -224,26 +458,44 @@ class DirectoryScanner:
         Returns:
             str: Category name from configuration
         """
-        for category, extensions in self.file_categories.items():
-            if extension.lower() in extensions:
-                return category
-        return "Other"
+        return self._category_by_extension.get(extension.lower(), "Other")
 
-    def _get_file_metadata(self, file_path: Path) -> Optional[Dict]:
+    def _get_file_metadata(
+        self, file_path: Path, stats: Optional[os.stat_result] = None
+    ) -> Optional[Dict]:
         """
         Get metadata for a single file.
 
         Args:
             file_path (Path): Path to the file
+            stats (Optional[os.stat_result]): Stat result from the directory walk
 
         Returns:
             Optional[Dict]: File metadata or None if file should be skipped
         """
         try:
-            stats = file_path.stat()
-            mime_type = self._get_mime_type(file_path)
+            if stats is None:
+                stats = file_path.stat()
             extension = file_path.suffix.lower()
 
+            cache_key = None
+            if self.metadata_cache is not None:
+                cache_key = os.path.abspath(file_path)
+                metadata = self.metadata_cache.get(cache_key, stats)
+                if metadata is not None:
+                    # The same file may have been scanned through another
+                    # path, e.g. relative to another working directory
+                    metadata["path"] = str(file_path)
+                    metadata["name"] = file_path.name
+                    # Categories come from the current configuration
+                    metadata["category"] = self._get_file_category(extension)
+                    return metadata
+
+            # Known extensions determine the MIME type without reading the file
+            mime_type = EXTENSION_MIME_TYPES.get(extension) or self._get_mime_type(
+                file_path, detect=extension in self._mime_interesting_exts
+            )
+
             # Determine file category
             category = self._get_file_category(extension)
 
@@ -252,23 +504,27 @@ class DirectoryScanner:
                 "name": file_path.name,
                 "extension": extension,
                 "size": stats.st_size,
-                "created": datetime.fromtimestamp(stats.st_ctime).isoformat(),
-                "modified": datetime.fromtimestamp(stats.st_mtime).isoformat(),
+                "created": _iso_timestamp(stats.st_ctime),
+                "modified": _iso_timestamp(stats.st_mtime),
                 "mime_type": mime_type,
                 "content": None,
                 "category": category,
                 "additional_metadata": {},
             }
 
-            # Extract text content if possible
+            # Extract a preview of the text content if possible
             if metadata["extension"] in self.text_extensions:
-                try:
-                    with open(file_path, "r", encoding="utf-8") as f:
-                        metadata["content"] = f.read()
-                except UnicodeDecodeError:
-                    metadata["content"] = None
-
-            elif metadata["extension"] in self.supported_binary:
+                with open(file_path, "rb") as f:
+                    data = f.read(CONTENT_PREVIEW_BYTES)
+                # NUL bytes mean binary data behind a text extension; skip it
+                if b"\0" not in data:
+                    text = data.decode("utf-8", errors="ignore")
+                    metadata["content"] = text[:CONTENT_PREVIEW_CHARS]
+
+            elif (
+                metadata["extension"] in self.supported_binary
+                and stats.st_size <= self.max_file_size
+            ):
                 extractor = self.supported_binary[metadata["extension"]]
                 metadata["content"] = extractor(file_path)
 
@@ -279,7 +535,15 @@ class DirectoryScanner:
                     metadata["additional_metadata"] = image_metadata
                     # If we have a description from EXIF data, use it as content
                     if "ImageDescription" in image_metadata:
-                        metadata["content"] = image_metadata["ImageDescription"]
+                        description = str(image_metadata["ImageDescription"])
+                        metadata["content"] = description[:CONTENT_PREVIEW_CHARS]
+
+            if cache_key is not None:
+                # A file whose metadata can't be cached is still scanned
+                try:
+                    self.metadata_cache.put(cache_key, metadata, stats)
+                except Exception as e:
+                    print(f"Error caching metadata for {file_path}: {str(e)}")
 
             return metadata
 
@@ -287,54 +551,103 @@ class DirectoryScanner:
             print(f"Error getting metadata for {file_path}: {str(e)}")
             return None
 
-    def _get_mime_type(self, file_path: Path) -> str:
-        """Get the MIME type of a file."""
-        if MAGIC_AVAILABLE:
+    def _get_magic(self):
+        """Get the current thread's libmagic handle, or None if unavailable."""
+        handle = getattr(self._magic_local, "handle", False)
+        if handle is False:
+            handle = None
+            if MAGIC_AVAILABLE:
+                try:
+                    handle = magic.Magic(mime=True)
+                except Exception:
+                    pass
+            self._magic_local.handle = handle
+        return handle
+
+    def _get_mime_type(self, file_path: Path, detect: bool = True) -> str:
+        """
+        Get the MIME type of a file.
+
+        Args:
+            file_path (Path): Path to the file
+            detect (bool): Whether to inspect the file with libmagic instead of
+                only guessing from the extension
+
+        Returns:
+            str: MIME type
+        """
+        magic_handle = self._get_magic() if detect else None
+        if magic_handle is not None:
             try:
-                return magic.from_file(str(file_path), mime=True)
+                return magic_handle.from_file(str(file_path))
             except Exception:
                 pass
 
         # Fallback to extension-based mime type guess
         ext = os.path.splitext(file_path)[1].lower()
-        if ext in [".txt", ".md"]:
-            return "text/plain"
-        elif ext == ".html":
-            return "text/html"
-        elif ext == ".py":
-            return "text/x-python"
-        elif ext == ".js":
-            return "application/javascript"
-        elif ext == ".json":
-            return "application/json"
-        elif ext == ".pdf":
-            return "application/pdf"
-        elif ext == ".docx":
-            return "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
-        else:
-            return "application/octet-stream"
+        return EXTENSION_MIME_TYPES.get(ext, "application/octet-stream")
 
     def _extract_pdf_text(self, file_path: Path) -> Optional[str]:
         """Extract text content from PDF files."""
         if not PDF_AVAILABLE:
             return "PDF library not available"
+
+        if PDFIUM_AVAILABLE:
+            try:
+                return self._extract_pdf_text_pdfium(file_path)
+            except Exception:
+                # Fall back to PyPDF2 for files PDFium can't parse
+                pass
+
+        if not PYPDF2_AVAILABLE:
+            return None
         try:
             text = []
             with open(file_path, "rb") as file:
                 reader = PyPDF2.PdfReader(file)
+                length = 0
                 for page in reader.pages:
                     text.append(page.extract_text())
-            return "\n".join(text)
+                    length += len(text[-1])
+                    if length >= CONTENT_PREVIEW_CHARS:
+                        break
+            return "\n".join(text)[:CONTENT_PREVIEW_CHARS]
         except Exception:
             return None
 
+    def _extract_pdf_text_pdfium(self, file_path: Path) -> str:
+        """Extract text content from a PDF file with PDFium."""
+        with PDFIUM_LOCK:
+            pdf = pdfium.PdfDocument(str(file_path))
+            try:
+                text = []
+                length = 0
+                for page in pdf:
+                    textpage = page.get_textpage()
+                    text.append(textpage.get_text_range())
+                    textpage.close()
+                    page.close()
+                    length += len(text[-1])
+                    if length >= CONTENT_PREVIEW_CHARS:
+                        break
+                return "\n".join(text)[:CONTENT_PREVIEW_CHARS]
+            finally:
+                pdf.close()
+
     def _extract_docx_text(self, file_path: Path) -> Optional[str]:
         """Extract text content from DOCX files."""
         if not DOCX_AVAILABLE:
             return "DOCX library not available"
         try:
             doc = Document(file_path)
-            return "\n".join([para.text for para in doc.paragraphs])
+            text = []
+            length = 0
+            for para in doc.paragraphs:
+                text.append(para.text)
+                length += len(para.text) + 1
+                if length >= CONTENT_PREVIEW_CHARS:
+                    break
+            return "\n".join(text)[:CONTENT_PREVIEW_CHARS]
         except Exception as e:
             print(f"Error extracting text from {file_path}: {e}")
             return None
@@ -373,10 +686,7 @@ class DirectoryScanner:
                     else:
                         # Convert bytes to string if needed
                         if isinstance(value, bytes):
-                            try:
-                                value = value.decode("utf-8")
-                            except UnicodeDecodeError:
-                                value = str(value)
+                            value = value.decode("utf-8", errors="ignore")
                         exif_data[tag] = value
 
             # Add basic image information
@@ -0,0 +1,226 @@
+"""Persistent cache of LLM analysis results keyed by document content."""
+
+import hashlib
+import json
+import sqlite3
+from array import array
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+# numpy is only needed for the semantic (embedding similarity) tier
+try:
+    import numpy as np
+
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# File name of the cache in the configured cache directory
+CACHE_FILE_NAME = "analysis.sqlite"
+
+
+class AnalysisCache:
+    """
+    Two-tier cache of analysis results.
+
+    Entries are looked up by the SHA-256 of the prepared document text first.
+    When an embedding is available, entries whose embedding is close enough to
+    it (cosine similarity above the threshold) are reused as well, so
+    near-duplicate files do not need a new LLM call.
+
+    Entries belong to a scope, such as the model and naming schemes that
+    produced them, and are only reused within it.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        similarity_threshold: Optional[float] = 0.92,
+        scope: str = "",
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            db_path: Path to the SQLite cache file
+            similarity_threshold: Minimum cosine similarity for a semantic
+                match, or None to only reuse exact matches
+            scope: Settings the cached analyses depend on
+        """
+        path = Path(db_path).expanduser()
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        self.conn = sqlite3.connect(str(path))
+        self.similarity_threshold = similarity_threshold
+        self.scope = scope
+        self._keys: List[str] = []
+        self._matrix = None  # Normalized embeddings, loaded on first use
+        self._dimension = None  # Embedding size of the loaded matrix
+
+        self._setup_tables()
+
+    def _setup_tables(self):
+        """Create the cache table if it doesn't exist."""
+        self.conn.execute(
+            """
+        CREATE TABLE IF NOT EXISTS analysis_cache (
+            key TEXT PRIMARY KEY,
+            tags TEXT,
+            suggested_folder TEXT,
+            description TEXT,
+            embedding BLOB,
+            scope TEXT
+        )
+        """
+        )
+
+        # Caches created before entries had a scope
+        columns = [
+            row[1] for row in self.conn.execute("PRAGMA table_info(analysis_cache)")
+        ]
+        if "scope" not in columns:
+            self.conn.execute("ALTER TABLE analysis_cache ADD COLUMN scope TEXT")
+        self.conn.commit()
+
+    def content_key(self, doc_text: str) -> str:
+        """Get the cache key for a prepared document text within the scope."""
+        return hashlib.sha256(f"{self.scope}\0{doc_text}".encode("utf-8")).hexdigest()
+
+    @property
+    def semantic_enabled(self) -> bool:
+        """Whether embedding similarity lookups are available."""
+        return NUMPY_AVAILABLE and self.similarity_threshold is not None
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the cached analysis for an exact content key.
+
+        Args:
+            key: Content key from content_key()
+
+        Returns:
+            Optional[Dict]: Cached tags, suggested folder and description
+        """
+        row = self.conn.execute(
+            "SELECT tags, suggested_folder, description FROM analysis_cache WHERE key = ?",
+            (key,),
+        ).fetchone()
+        if row:
+            return {
+                "tags": json.loads(row[0]),
+                "suggested_folder": row[1],
+                "description": row[2],
+            }
+        return None
+
+    def find_similar(self, embedding: List[float]) -> Optional[Dict[str, Any]]:
+        """
+        Get the cached analysis of the most similar document.
+
+        Args:
+            embedding: Embedding of the document to look up
+
+        Returns:
+            Optional[Dict]: Cached analysis if the best match is above the threshold
+        """
+        if not self.semantic_enabled:
+            return None
+
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        if not norm:
+            return None
+
+        # Only embeddings of the same size (i.e. model) are comparable
+        self._load_embeddings(vector.shape[0])
+        if not self._keys:
+            return None
+
+        similarities = self._matrix @ (vector / norm)
+        best = int(np.argmax(similarities))
+        if similarities[best] < self.similarity_threshold:
+            return None
+
+        return self.get(self._keys[best])
+
+    def put(
+        self,
+        key: str,
+        analysis: Dict[str, Any],
+        embedding: Optional[List[float]] = None,
+    ):
+        """
+        Store an analysis result.
+
+        Args:
+            key: Content key from content_key()
+            analysis: Analysis result with tags, suggested folder and description
+            embedding: Optional embedding of the document text
+        """
+        self.put_many([(key, analysis, embedding)])
+
+    def put_many(
+        self,
+        entries: List[Tuple[str, Dict[str, Any], Optional[List[float]]]],
+    ):
+        """
+        Store several analysis results in a single transaction.
+
+        Args:
+            entries: (key, analysis, embedding) tuples, see put()
+        """
+        rows = [
+            (
+                key,
+                json.dumps(analysis["tags"]),
+                analysis["suggested_folder"],
+                analysis["description"],
+                array("f", embedding).tobytes() if embedding else None,
+                self.scope,
+            )
+            for key, analysis, embedding in entries
+        ]
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO analysis_cache "
+            "(key, tags, suggested_folder, description, embedding, scope) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+        self.conn.commit()
+
+        if any(row[4] for row in rows):
+            # Reload the similarity matrix on the next lookup
+            self._matrix = None
+
+    def _load_embeddings(self, dimension: int):
+        """
+        Load the scope's cached embeddings into a matrix of normalized rows.
+
+        Args:
+            dimension: Size of the embeddings to load; others are skipped
+        """
+        if self._matrix is not None and self._dimension == dimension:
+            return
+
+        keys, vectors = [], []
+        rows = self.conn.execute(
+            "SELECT key, embedding FROM analysis_cache "
+            "WHERE embedding IS NOT NULL AND scope = ?",
+            (self.scope,),
+        )
+        for key, blob in rows:
+            vector = np.frombuffer(blob, dtype=np.float32)
+            norm = np.linalg.norm(vector)
+            if norm and vector.shape[0] == dimension:
+                keys.append(key)
+                vectors.append(vector / norm)
+
+        self._keys = keys
+        self._dimension = dimension
+        self._matrix = (
+            np.vstack(vectors) if vectors else np.empty((0, dimension), np.float32)
+        )
+
+    def close(self):
+        """Close the database connection."""
+        self.conn.close()
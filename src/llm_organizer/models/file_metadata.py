@@ -1,11 +1,124 @@
 """Models for representing file metadata."""
 
-import json
 import sqlite3
+from contextlib import contextmanager
 from dataclasses import dataclass, field
 from datetime import datetime
+from itertools import islice
+from operator import itemgetter
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from llm_organizer.utils import fast_json
+
+# Connection settings for the metadata database: a write-ahead log synced at
+# checkpoints instead of on every commit, a 20 MB page cache, in-memory
+# temporary tables and memory-mapped reads
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-20000",
+    "PRAGMA mmap_size=268435456",
+)
+
+# Rows handed to each executemany call by the bulk save methods
+SAVE_BATCH_SIZE = 1000
+
+# Paths bound per IN (...) lookup; older SQLite builds allow 999 variables
+LOOKUP_BATCH_SIZE = 900
+
+# Compiled statements kept per connection; sqlite3 caches 128 by default
+STATEMENT_CACHE_SIZE = 256
+
+# Columns written by the save methods
+METADATA_COLUMNS = (
+    "path",
+    "name",
+    "extension",
+    "mime_type",
+    "size",
+    "created",
+    "modified",
+    "content",
+    "category",
+)
+ANALYSIS_COLUMNS = ("path", "tags", "suggested_folder", "description", "category")
+
+
+def _upsert_sql(table: str, columns: Tuple[str, ...]) -> str:
+    """
+    Build an insert statement that updates existing rows of the path instead.
+
+    Unlike INSERT OR REPLACE, existing rows are updated in place rather than
+    deleted and inserted again.
+    """
+    updates = ", ".join(f"{column} = excluded.{column}" for column in columns[1:])
+    return (
+        f"INSERT INTO {table} ({', '.join(columns)}) "
+        f"VALUES ({', '.join('?' * len(columns))}) "
+        f"ON CONFLICT(path) DO UPDATE SET {updates}"
+    )
+
+
+SAVE_METADATA_SQL = _upsert_sql("file_metadata", METADATA_COLUMNS)
+SAVE_ANALYSIS_SQL = _upsert_sql("file_analysis", ANALYSIS_COLUMNS)
+
+# Analyses joined with their file metadata, see _analysis_from_row
+SELECT_ANALYSIS_SQL = """
+    SELECT f.path, f.name, f.extension, f.mime_type, f.category,
+           a.tags, a.description, a.suggested_folder
+    FROM file_metadata f
+    JOIN file_analysis a ON f.path = a.path
+"""
+SELECT_FILE_ANALYSIS_SQL = SELECT_ANALYSIS_SQL + "WHERE f.path = ?"
+
+
+def metadata_row(metadata: Dict[str, Any]) -> Tuple:
+    """
+    Get the database row of a scanner metadata dictionary.
+
+    Args:
+        metadata: File metadata from the scanner
+
+    Returns:
+        Tuple: Values of METADATA_COLUMNS
+    """
+    return (
+        metadata["path"],
+        metadata["name"],
+        metadata["extension"],
+        metadata["mime_type"],
+        metadata["size"],
+        metadata["created"],
+        metadata["modified"],
+        metadata["content"],
+        metadata.get("category", "Other"),
+    )
+
+
+def analysis_row(result: Dict[str, Any]) -> Tuple:
+    """
+    Get the database row of an analysis result, with its tags as UTF-8 JSON.
+
+    Args:
+        result: Analysis result from the indexer
+
+    Returns:
+        Tuple: Values of ANALYSIS_COLUMNS
+    """
+    return (
+        result["path"],
+        fast_json.dumps(result["tags"]),
+        result["suggested_folder"],
+        result["description"],
+        result.get("category", "Other"),
+    )
+
+
+def _iso_format(timestamp: Union[datetime, str]) -> str:
+    """Get a timestamp in ISO format, passing ISO strings through as is."""
+    return timestamp if isinstance(timestamp, str) else timestamp.isoformat()
 
 
 @dataclass
@@ -17,8 +130,9 @@ class FileMetadata:
     extension: str
     mime_type: str
     size: int
-    created: datetime
-    modified: datetime
+    # Timestamps, or their ISO format strings as produced by the scanner
+    created: Union[datetime, str]
+    modified: Union[datetime, str]
     content: Optional[str] = None
     category: str = "Other"
 
@@ -40,8 +154,8 @@ class FileMetadata:
             "extension": self.extension,
             "mime_type": self.mime_type,
             "size": self.size,
-            "created": self.created.isoformat(),
-            "modified": self.modified.isoformat(),
+            "created": _iso_format(self.created),
+            "modified": _iso_format(self.modified),
             "content": self.content,
             "category": self.category,
         }
@@ -96,9 +210,17 @@ class MetadataStore:
         """
         if db_path is None:
             # Use in-memory database
-            self.conn = sqlite3.connect(":memory:")
+            self.conn = sqlite3.connect(
+                ":memory:", cached_statements=STATEMENT_CACHE_SIZE
+            )
         else:
-            self.conn = sqlite3.connect(db_path)
+            self.conn = sqlite3.connect(db_path, cached_statements=STATEMENT_CACHE_SIZE)
+
+        for pragma in SQLITE_PRAGMAS:
+            self.conn.execute(pragma)
+
+        # Inside bulk(), saves are committed together when the block exits
+        self._in_bulk = False
 
         self._setup_tables()
 
@@ -128,7 +250,7 @@ class MetadataStore:
             """
         CREATE TABLE IF NOT EXISTS file_analysis (
             path TEXT PRIMARY KEY,
-            tags TEXT,
+            tags BLOB,
             suggested_folder TEXT,
             description TEXT,
             category TEXT,
@@ -141,66 +263,91 @@ class MetadataStore:
 
     def save_metadata(self, metadata: FileMetadata):
         """Save file metadata to the database."""
-        cursor = self.conn.cursor()
-        data = metadata.to_dict()
+        self.save_metadata_many([metadata])
 
-        # Create placeholders and values for SQL query
-        placeholders = ", ".join(["?"] * len(data))
-        columns = ", ".join(data.keys())
-        values = list(data.values())
+    def save_metadata_many(self, items: Iterable[FileMetadata]):
+        """
+        Save metadata of several files in a single transaction.
 
-        query = (
-            f"INSERT OR REPLACE INTO file_metadata ({columns}) VALUES ({placeholders})"
-        )
-        cursor.execute(query, values)
-        self.conn.commit()
+        Args:
+            items: FileMetadata objects, consumed lazily in batches
+        """
+        get_row = itemgetter(*METADATA_COLUMNS)
+        self.save_metadata_rows(get_row(metadata.to_dict()) for metadata in items)
+
+    def save_metadata_rows(self, rows: Iterable[Tuple]):
+        """
+        Save metadata rows of several files in a single transaction.
+
+        Args:
+            rows: Tuples of METADATA_COLUMNS values, e.g. from metadata_row()
+        """
+        self._save_many(SAVE_METADATA_SQL, rows)
 
     def save_analysis(self, analysis: FileAnalysis):
         """Save file analysis to the database."""
-        cursor = self.conn.cursor()
-        data = analysis.to_dict()
+        self.save_analysis_many([analysis])
 
-        # Convert tags list to JSON string
-        data["tags"] = json.dumps(data["tags"])
+    def save_analysis_many(self, items: Iterable[FileAnalysis]):
+        """
+        Save analyses of several files in a single transaction.
 
-        # Create placeholders and values for SQL query
-        placeholders = ", ".join(["?"] * len(data))
-        columns = ", ".join(data.keys())
-        values = list(data.values())
+        Args:
+            items: FileAnalysis objects, consumed lazily in batches
+        """
+        self.save_analysis_rows(analysis_row(analysis.to_dict()) for analysis in items)
 
-        query = (
-            f"INSERT OR REPLACE INTO file_analysis ({columns}) VALUES ({placeholders})"
-        )
-        cursor.execute(query, values)
-        self.conn.commit()
+    def save_analysis_rows(self, rows: Iterable[Tuple]):
+        """
+        Save analysis rows of several files in a single transaction.
 
-    def get_all_analysis(self) -> List[Dict[str, Any]]:
-        """Get all file analysis results."""
-        cursor = self.conn.cursor()
-        cursor.execute(
-            """
-        SELECT f.path, f.name, f.extension, f.mime_type, f.category,
-               a.tags, a.description, a.suggested_folder
-        FROM file_metadata f
-        JOIN file_analysis a ON f.path = a.path
+        Args:
+            rows: Tuples of ANALYSIS_COLUMNS values, e.g. from analysis_row()
         """
-        )
+        self._save_many(SAVE_ANALYSIS_SQL, rows)
 
-        results = []
-        for row in cursor.fetchall():
-            result = {
-                "path": row[0],
-                "name": row[1],
-                "extension": row[2],
-                "mime_type": row[3],
-                "category": row[4],
-                "tags": json.loads(row[5]),
-                "description": row[6],
-                "suggested_folder": row[7],
-            }
-            results.append(result)
-
-        return results
+    def _save_many(self, query: str, rows: Iterable[Tuple]):
+        """
+        Save rows with executemany, SAVE_BATCH_SIZE at a time.
+
+        Args:
+            query: Upsert statement built by _upsert_sql
+            rows: Tuples of the statement's column values
+        """
+        rows = iter(rows)
+        with self.bulk():
+            while True:
+                batch = list(islice(rows, SAVE_BATCH_SIZE))
+                if not batch:
+                    break
+                self.conn.executemany(query, batch)
+
+    @contextmanager
+    def bulk(self):
+        """
+        Group saves into a single transaction.
+
+        Saves inside the block are committed once when it exits, instead of
+        once per row, and rolled back if it raises.
+        """
+        if self._in_bulk:
+            yield self
+            return
+
+        self._in_bulk = True
+        try:
+            yield self
+            self.conn.commit()
+        except BaseException:
+            self.conn.rollback()
+            raise
+        finally:
+            self._in_bulk = False
+
+    def get_all_analysis(self) -> List[Dict[str, Any]]:
+        """Get all file analysis results."""
+        rows = self.conn.execute(SELECT_ANALYSIS_SQL)
+        return [self._analysis_from_row(row) for row in rows]
 
     def file_exists(self, file_path: str) -> bool:
         """
@@ -244,32 +391,49 @@ class MetadataStore:
         Returns:
             Optional[Dict]: Analysis data or None if not found
         """
-        cursor = self.conn.cursor()
-        cursor.execute(
-            """
-            SELECT f.path, f.name, f.extension, f.mime_type, f.category,
-                   a.tags, a.description, a.suggested_folder
-            FROM file_metadata f
-            JOIN file_analysis a ON f.path = a.path
-            WHERE f.path = ?
-            """,
-            (file_path,),
-        )
-
-        row = cursor.fetchone()
+        row = self.conn.execute(SELECT_FILE_ANALYSIS_SQL, (file_path,)).fetchone()
         if row:
-            return {
-                "path": row[0],
-                "name": row[1],
-                "extension": row[2],
-                "mime_type": row[3],
-                "category": row[4],
-                "tags": json.loads(row[5]),
-                "description": row[6],
-                "suggested_folder": row[7],
-            }
+            return self._analysis_from_row(row)
         return None
 
+    @staticmethod
+    def _analysis_from_row(row: Tuple) -> Dict[str, Any]:
+        """Build an analysis result from a row of SELECT_ANALYSIS_SQL."""
+        return {
+            "path": row[0],
+            "name": row[1],
+            "extension": row[2],
+            "mime_type": row[3],
+            "category": row[4],
+            "tags": fast_json.loads(row[5]),
+            "description": row[6],
+            "suggested_folder": row[7],
+        }
+
+    def get_file_analyses(self, file_paths: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Get the analyses of several files with one query per LOOKUP_BATCH_SIZE paths.
+
+        Args:
+            file_paths: Paths of the files
+
+        Returns:
+            Dict[str, Dict]: Analysis data by path, for the files that have one
+        """
+        analyses = {}
+        paths = iter(file_paths)
+        while True:
+            batch = list(islice(paths, LOOKUP_BATCH_SIZE))
+            if not batch:
+                break
+            placeholders = ", ".join("?" * len(batch))
+            rows = self.conn.execute(
+                f"{SELECT_ANALYSIS_SQL}WHERE f.path IN ({placeholders})", batch
+            )
+            for row in rows:
+                analyses[row[0]] = self._analysis_from_row(row)
+        return analyses
+
     def get_analysis_batch(self, file_paths: List[str]) -> List[Dict[str, Any]]:
         """
         Get analysis for multiple files.
@@ -280,12 +444,8 @@ class MetadataStore:
         Returns:
             List[Dict]: List of analysis results
         """
-        results = []
-        for path in file_paths:
-            analysis = self.get_file_analysis(path)
-            if analysis:
-                results.append(analysis)
-        return results
+        analyses = self.get_file_analyses(file_paths)
+        return [analyses[path] for path in file_paths if path in analyses]
 
     def close(self):
         """Close the database connection."""
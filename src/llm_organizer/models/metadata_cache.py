@@ -0,0 +1,155 @@
+"""Persistent cache of scanned file metadata keyed by path, mtime and size."""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+# File name of the cache in the configured cache directory
+CACHE_FILE_NAME = "metadata.sqlite"
+
+# Least recently used entries beyond this count are evicted
+DEFAULT_MAX_ENTRIES = 10_000
+
+
+class MetadataCache:
+    """
+    LRU cache of file metadata from previous scans.
+
+    An entry is only returned while the file's modification time and size are
+    unchanged, so an unchanged file costs one stat instead of a MIME type
+    detection and content extraction. Lookups are safe from several scan
+    threads; new entries and recency updates are written in one transaction by
+    flush().
+    """
+
+    def __init__(self, db_path: str, max_entries: int = DEFAULT_MAX_ENTRIES):
+        """
+        Initialize the cache.
+
+        Args:
+            db_path: Path to the SQLite cache file
+            max_entries: Number of entries kept after each flush
+        """
+        path = Path(db_path).expanduser()
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Lookups come from the scan threads, serialized by the lock
+        self.conn = sqlite3.connect(str(path), check_same_thread=False)
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._used: List[str] = []
+        self._pending: List[Tuple[str, int, int, str]] = []
+
+        self._setup_tables()
+
+    def _setup_tables(self):
+        """Create the cache table if it doesn't exist."""
+        self.conn.execute(
+            """
+        CREATE TABLE IF NOT EXISTS metadata_cache (
+            path TEXT PRIMARY KEY,
+            mtime_ns INTEGER,
+            size INTEGER,
+            metadata TEXT,
+            last_used REAL
+        )
+        """
+        )
+        self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_metadata_cache_last_used "
+            "ON metadata_cache (last_used)"
+        )
+        self.conn.commit()
+
+    def get(self, path: str, stats: os.stat_result) -> Optional[Dict[str, Any]]:
+        """
+        Get the cached metadata of a file if it hasn't changed.
+
+        Args:
+            path: Absolute path of the file
+            stats: Current stat result of the file
+
+        Returns:
+            Optional[Dict]: Cached metadata, or None if missing or stale
+        """
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT metadata FROM metadata_cache "
+                "WHERE path = ? AND mtime_ns = ? AND size = ?",
+                (path, stats.st_mtime_ns, stats.st_size),
+            ).fetchone()
+            if row:
+                self.hits += 1
+                self._used.append(path)
+                return json.loads(row[0])
+
+            self.misses += 1
+            return None
+
+    def put(self, path: str, metadata: Dict[str, Any], stats: os.stat_result):
+        """
+        Queue a file's metadata to be stored on the next flush().
+
+        Values JSON can't represent, such as PIL's EXIF rationals, are stored
+        as strings.
+
+        Args:
+            path: Absolute path of the file
+            metadata: Metadata dictionary from the scanner
+            stats: Stat result the metadata was computed from
+        """
+        entry = (
+            path,
+            stats.st_mtime_ns,
+            stats.st_size,
+            json.dumps(metadata, default=str),
+        )
+        with self._lock:
+            self._pending.append(entry)
+
+    def flush(self):
+        """Store queued entries, mark hits as used and evict old entries."""
+        with self._lock:
+            now = time.time()
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO metadata_cache "
+                "(path, mtime_ns, size, metadata, last_used) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [entry + (now,) for entry in self._pending],
+            )
+            self.conn.executemany(
+                "UPDATE metadata_cache SET last_used = ? WHERE path = ?",
+                [(now, path) for path in self._used],
+            )
+            self.conn.execute(
+                "DELETE FROM metadata_cache WHERE path IN ("
+                "SELECT path FROM metadata_cache "
+                "ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+            self.conn.commit()
+            self._pending = []
+            self._used = []
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get cache usage statistics.
+
+        Returns:
+            Dict[str, int]: Hits and misses since creation, and stored entries
+        """
+        with self._lock:
+            (entries,) = self.conn.execute(
+                "SELECT COUNT(*) FROM metadata_cache"
+            ).fetchone()
+        return {"hits": self.hits, "misses": self.misses, "entries": entries}
+
+    def close(self):
+        """Close the database connection."""
+        self.conn.close()
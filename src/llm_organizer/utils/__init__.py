@@ -1,40 +1,63 @@
 """Utility functions for the LLM Directory Organizer."""
 
 import re
+from functools import lru_cache
+from typing import Callable, Dict, List
 
+# Characters replaced by word breaks before applying a naming scheme
+NON_ALPHANUMERIC_RE = re.compile(r"[^a-zA-Z0-9]")
 
-def format_naming_scheme(text: str, scheme: str) -> str:
+# Formatted names remembered per naming scheme; folder names, categories and
+# tags repeat across files
+FORMAT_CACHE_SIZE = 4096
+
+# How each naming scheme joins the normalized (lowercase) words of a name
+NAMING_SCHEMES: Dict[str, Callable[[List[str]], str]] = {
+    "snake_case": "_".join,
+    "camel_case": lambda words: words[0]
+    + "".join(word.capitalize() for word in words[1:]),
+    "pascal_case": lambda words: "".join(word.capitalize() for word in words),
+    "title_case": lambda words: " ".join(word.capitalize() for word in words),
+    "lower_case": " ".join,
+}
+
+
+@lru_cache(maxsize=None)
+def get_naming_formatter(scheme: str) -> Callable[[str], str]:
     """
-    Format text according to the specified naming scheme.
+    Get a function formatting text according to a naming scheme.
+
+    Resolving the scheme once is cheaper than passing its name to
+    format_naming_scheme for every name formatted. The formatter remembers
+    the last FORMAT_CACHE_SIZE names it formatted and is shared by all callers
+    using the scheme.
 
     Args:
-        text: The text to format
         scheme: The naming scheme (snake_case, camel_case, pascal_case, title_case, lower_case)
 
     Returns:
-        Formatted text
+        Callable[[str], str]: Formatter; unknown schemes format as snake_case
     """
-    # First normalize the string: replace non-alphanumeric with spaces and lowercase
-    normalized = re.sub(r"[^a-zA-Z0-9]", " ", text).lower()
-    words = normalized.split()
-
-    if not words:
-        return ""
+    join = NAMING_SCHEMES.get(scheme, NAMING_SCHEMES["snake_case"])
 
-    if scheme == "snake_case":
-        return "_".join(words)
+    @lru_cache(maxsize=FORMAT_CACHE_SIZE)
+    def format_name(text: str) -> str:
+        # First normalize the string: replace non-alphanumeric with spaces and lowercase
+        words = NON_ALPHANUMERIC_RE.sub(" ", text).lower().split()
+        return join(words) if words else ""
 
-    elif scheme == "camel_case":
-        return words[0] + "".join(word.capitalize() for word in words[1:])
+    return format_name
 
-    elif scheme == "pascal_case":
-        return "".join(word.capitalize() for word in words)
 
-    elif scheme == "title_case":
-        return " ".join(word.capitalize() for word in words)
+def format_naming_scheme(text: str, scheme: str) -> str:
+    """
+    Format text according to the specified naming scheme.
 
-    elif scheme == "lower_case":
-        return " ".join(words)
+    Args:
+        text: The text to format
+        scheme: The naming scheme (snake_case, camel_case, pascal_case, title_case, lower_case)
 
-    # Default to snake_case if scheme not recognized
-    return "_".join(words)
+    Returns:
+        Formatted text
+    """
+    return get_naming_formatter(scheme)(text)
@@ -1,10 +1,19 @@
 """Operation logger for tracking file operations and providing undo functionality."""
 
-import json
+import os
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional
+
+from llm_organizer.utils import fast_json
+
+# File in the log directory holding the name of the newest operations log
+LATEST_POINTER = "latest"
+
+# Threads used for undo moves that have to copy between filesystems
+UNDO_COPY_WORKERS = 8
 
 
 class OperationLogger:
@@ -14,20 +23,49 @@ class OperationLogger:
         self.log_dir = Path.home() / ".file_organizer" / "logs"
         self.log_dir.mkdir(parents=True, exist_ok=True)
 
-    def log_operations(self, operations: List[Dict]):
+    def log_operations(self, operations: Iterable[Dict]) -> int:
         """
-        Log file operations to a JSON file.
+        Log file operations to a newline-delimited JSON file.
+
+        Operations are written one per line as they are produced, so a
+        generator such as FileOrganizer.iter_execute_plan() can be logged while
+        it runs and an interrupted run still leaves a usable log.
 
         Args:
-            operations (List[Dict]): List of operations to log
+            operations (Iterable[Dict]): Operations to log
+
+        Returns:
+            int: Number of operations logged
         """
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        log_file = self.log_dir / f"operations_{timestamp}.json"
+        log_file = self.log_dir / f"operations_{timestamp}.ndjson"
+
+        count = 0
+        with open(log_file, "wb") as f:
+            # Header line; operation lines are the ones with a "type"
+            f.write(fast_json.dumps({"timestamp": datetime.now().isoformat()}) + b"\n")
+            f.flush()
+            (self.log_dir / LATEST_POINTER).write_text(log_file.name, encoding="utf-8")
+
+            for operation in operations:
+                f.write(fast_json.dumps(operation) + b"\n")
+                f.flush()
+                count += 1
 
-        log_data = {"timestamp": datetime.now().isoformat(), "operations": operations}
+        return count
+
+    def _latest_log_file(self) -> Optional[Path]:
+        """Get the newest operations log, using the pointer file when present."""
+        try:
+            name = (self.log_dir / LATEST_POINTER).read_text(encoding="utf-8")
+            latest_log = self.log_dir / name.strip()
+            if latest_log.is_file():
+                return latest_log
+        except OSError:
+            pass
 
-        with open(log_file, "w", encoding="utf-8") as f:
-            json.dump(log_data, f, indent=2, ensure_ascii=False)
+        # Logs written before the pointer existed; timestamps sort by name
+        return max(self.log_dir.glob("operations_*.*json"), default=None)
 
     def get_last_operations(self) -> Optional[List[Dict]]:
         """
@@ -38,17 +76,26 @@ class OperationLogger:
         """
         try:
             # Get the most recent log file
-            log_files = sorted(self.log_dir.glob("operations_*.json"))
-            if not log_files:
+            latest_log = self._latest_log_file()
+            if latest_log is None:
                 return None
 
-            latest_log = log_files[-1]
+            # Logs from older versions are a single JSON document
+            if latest_log.suffix == ".json":
+                return fast_json.loads(latest_log.read_bytes())["operations"]
 
-            # Read the operations
-            with open(latest_log, "r", encoding="utf-8") as f:
-                log_data = json.load(f)
+            operations = []
+            with open(latest_log, "rb") as f:
+                for line in f:
+                    try:
+                        record = fast_json.loads(line)
+                    except ValueError:
+                        # Blank line, or a line cut short by an interrupted run
+                        continue
+                    if "type" in record:
+                        operations.append(record)
 
-            return log_data["operations"]
+            return operations
 
         except Exception as e:
             print(f"Error reading operations log: {str(e)}")
@@ -58,10 +105,15 @@ class OperationLogger:
         """
         Undo a set of file operations.
 
+        Files are moved back first, then the folders created by the operation
+        are removed if they are empty.
+
         Args:
             operations (List[Dict]): List of operations to undo
         """
         # Reverse the operations to undo them in the correct order
+        cross_device = []
+        folders = []
         for operation in reversed(operations):
             try:
                 if operation["type"] == "move":
@@ -69,20 +121,39 @@ class OperationLogger:
                     destination = Path(operation["destination"])
 
                     if destination.exists():
-                        # Create parent directory if it doesn't exis
+                        # Create parent directory if it doesn't exist
                         source.parent.mkdir(parents=True, exist_ok=True)
-                        # Move the file back
-                        shutil.move(str(destination), str(source))
+
+                        # Same filesystem: a rename is enough
+                        if destination.stat().st_dev == source.parent.stat().st_dev:
+                            os.replace(destination, source)
+                        else:
+                            cross_device.append(operation)
 
                 elif operation["type"] == "create_folder":
-                    folder_path = Path(operation["path"])
-                    # Only remove if empty
-                    try:
-                        folder_path.rmdir()
-                    except OSError:
-                        # Folder not empty, skip
-                        pass
+                    folders.append(operation)
 
             except Exception as e:
                 print(f"Error undoing operation {operation}: {str(e)}")
                 continue
+
+        # Moves between filesystems copy data, so run them in parallel
+        if cross_device:
+            with ThreadPoolExecutor(max_workers=UNDO_COPY_WORKERS) as executor:
+                list(executor.map(self._undo_copy_move, cross_device))
+
+        for operation in folders:
+            folder_path = Path(operation["path"])
+            # Only remove if empty
+            try:
+                folder_path.rmdir()
+            except OSError:
+                # Folder not empty, skip
+                pass
+
+    def _undo_copy_move(self, operation: Dict):
+        """Move a file back across filesystems."""
+        try:
+            shutil.move(operation["destination"], operation["source"])
+        except Exception as e:
+            print(f"Error undoing operation {operation}: {str(e)}")
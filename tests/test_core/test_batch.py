@@ -0,0 +1,139 @@
+"""Tests for the Batch API helpers."""
+
+import json
+from types import SimpleNamespace
+
+import pytest
+
+import llm_organizer.core.batch as batch_module
+from llm_organizer.core.batch import BATCH_ENDPOINT, BatchQueue, build_batch_line
+
+
+class FakeBatchClient:
+    """OpenAI client stub answering a batch with canned output lines."""
+
+    def __init__(self, statuses, output_lines=None):
+        self.statuses = list(statuses)
+        self.output_lines = output_lines
+        self.uploaded = None
+        self.retrieved = 0
+        self.files = SimpleNamespace(create=self._create_file, content=self._content)
+        self.batches = SimpleNamespace(
+            create=self._create_batch, retrieve=self._retrieve
+        )
+
+    def _create_file(self, file, purpose):
+        assert purpose == "batch"
+        self.uploaded = file[1].decode("utf-8")
+        return SimpleNamespace(id="file-input")
+
+    def _create_batch(self, input_file_id, endpoint, completion_window):
+        assert input_file_id == "file-input"
+        assert endpoint == BATCH_ENDPOINT
+        return SimpleNamespace(id="batch-1")
+
+    def _retrieve(self, batch_id):
+        status = self.statuses[min(self.retrieved, len(self.statuses) - 1)]
+        self.retrieved += 1
+        output_file_id = "file-output" if self.output_lines is not None else None
+        return SimpleNamespace(
+            id=batch_id, status=status, output_file_id=output_file_id
+        )
+
+    def _content(self, file_id):
+        assert file_id == "file-output"
+        return SimpleNamespace(text="\n".join(self.output_lines) + "\n")
+
+
+def output_line(custom_id, content=None, status_code=200):
+    """Build one line of a batch output file."""
+    body = {"choices": [{"message": {"content": content}}]} if content else {}
+    return json.dumps(
+        {
+            "custom_id": custom_id,
+            "response": {"status_code": status_code, "body": body},
+        }
+    )
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Record the waits between status checks instead of sleeping."""
+    waits = []
+    monkeypatch.setattr(batch_module.time, "sleep", waits.append)
+    return waits
+
+
+def test_build_batch_line():
+    """Test building a request line of a batch input file."""
+    body = {"model": "test_model", "messages": [{"role": "user", "content": "héllo"}]}
+    line = build_batch_line("file-1", body)
+
+    assert "\n" not in line
+    assert "héllo" in line
+    assert json.loads(line) == {
+        "custom_id": "file-1",
+        "method": "POST",
+        "url": BATCH_ENDPOINT,
+        "body": body,
+    }
+
+
+def test_batch_queue_run(sleeps):
+    """Test that answers are mapped to their requests by custom_id."""
+    client = FakeBatchClient(
+        ["validating", "in_progress", "in_progress", "completed"],
+        [
+            output_line("second", "answer 2"),
+            output_line("error", status_code=500),
+            "",
+            output_line("first", "answer 1"),
+        ],
+    )
+    queue = BatchQueue()
+    queue.add("first", {"model": "test_model"})
+    queue.add("second", {"model": "test_model"})
+    queue.add("error", {"model": "test_model"})
+    assert len(queue) == 3
+
+    results = queue.run(client, poll_interval=1.0)
+
+    assert results == {"first": "answer 1", "second": "answer 2"}
+    assert [json.loads(line)["custom_id"] for line in client.uploaded.splitlines()] == [
+        "first",
+        "second",
+        "error",
+    ]
+    assert len(queue) == 0
+
+    # The wait between status checks doubles
+    assert sleeps == [1.0, 2.0, 4.0]
+
+
+def test_wait_for_batch_caps_poll_interval(sleeps):
+    """Test that the wait between status checks doesn't exceed the maximum."""
+    client = FakeBatchClient(["in_progress"] * 5 + ["completed"], [])
+    batch_module.wait_for_batch(
+        client, "batch-1", poll_interval=3.0, max_poll_interval=5.0
+    )
+    assert sleeps == [3.0, 5.0, 5.0, 5.0, 5.0]
+
+
+@pytest.mark.parametrize("status", ["failed", "expired", "cancelled"])
+def test_batch_queue_run_unsuccessful(sleeps, status):
+    """Test that a batch ending without completing raises an error."""
+    client = FakeBatchClient(["in_progress", status])
+    queue = BatchQueue()
+    queue.add("first", {"model": "test_model"})
+
+    with pytest.raises(RuntimeError, match=status):
+        queue.run(client, poll_interval=1.0)
+
+
+def test_batch_without_output_file(sleeps):
+    """Test a completed batch in which every request failed."""
+    client = FakeBatchClient(["completed"])
+    queue = BatchQueue()
+    queue.add("first", {"model": "test_model"})
+
+    assert queue.run(client) == {}
@@ -0,0 +1,155 @@
+"""Tests for the indexer module."""
+
+import pytest
+
+from llm_organizer.core.indexer import FALLBACK_DESCRIPTION, FileIndexer
+
+# Embeddings of the test files' contents; "similar" is exactly 0.6 similar
+# to "original" and "different" slightly less
+EMBEDDINGS = {
+    "original": [1.0, 0.0],
+    "similar": [3.0, 4.0],
+    "different": [3.0, 4.1],
+}
+
+
+def make_metadata(name, content):
+    """Build scanner metadata for a text file."""
+    return {
+        "path": f"/data/{name}",
+        "name": name,
+        "extension": ".txt",
+        "mime_type": "text/plain",
+        "size": len(content) if content else 2048,
+        "created": "2024-01-01T00:00:00",
+        "modified": "2024-01-01T00:00:00",
+        "category": "Documents",
+        "content": content,
+    }
+
+
+@pytest.fixture
+def indexer(temp_dir, monkeypatch):
+    """Create an indexer with the analysis cache and stubbed API calls."""
+    pytest.importorskip("numpy")
+    indexer = FileIndexer(
+        {
+            "openai_api_key": "test_api_key",
+            "use_analysis_cache": True,
+            "use_semantic_cache": True,
+            "analysis_cache_path": str(temp_dir / "analysis.sqlite"),
+            "semantic_cache_threshold": 0.6,
+        }
+    )
+    indexer._api_ok = True
+    indexer.analyzed = []
+    indexer.embedded = []
+    indexer.description = "Quarterly report."
+
+    def run_analysis(files, batch, on_result=None):
+        indexer.analyzed.extend(metadata["name"] for metadata in files)
+        return [
+            {
+                "path": metadata["path"],
+                "tags": ["reports"],
+                "suggested_folder": f"folder_of_{metadata['name']}",
+                "description": indexer.description,
+                "category": "Documents",
+            }
+            for metadata in files
+        ]
+
+    def embed(texts):
+        indexer.embedded.extend(texts)
+        return [
+            next(
+                (vector for content, vector in EMBEDDINGS.items() if content in text),
+                EMBEDDINGS["original"],
+            )
+            for text in texts
+        ]
+
+    monkeypatch.setattr(indexer, "_run_analysis", run_analysis)
+    monkeypatch.setattr(indexer, "_embed", embed)
+    return indexer
+
+
+def test_analysis_cache_exact_hit(indexer):
+    """Test that a file with unchanged content reuses its cached analysis."""
+    metadata = make_metadata("report.txt", "original")
+    first = indexer.analyze_files([metadata])
+    assert indexer.analyzed == ["report.txt"]
+
+    second = indexer.analyze_files([metadata])
+    assert indexer.analyzed == ["report.txt"]
+    assert second == first
+
+
+def test_analysis_cache_similar_hit(indexer):
+    """Test that a file at the similarity threshold reuses a similar analysis."""
+    indexer.analyze_files([make_metadata("report.txt", "original")])
+
+    results = indexer.analyze_files([make_metadata("copy.txt", "similar")])
+    assert indexer.analyzed == ["report.txt"]
+    assert results[0]["path"] == "/data/copy.txt"
+    assert results[0]["suggested_folder"] == "folder_of_report.txt"
+
+    # The similar match is stored under the file's own content key
+    indexer._embed = None
+    indexer.analyze_files([make_metadata("copy.txt", "similar")])
+    assert indexer.analyzed == ["report.txt"]
+
+
+def test_analysis_cache_below_threshold(indexer):
+    """Test that a file below the similarity threshold is analyzed."""
+    indexer.analyze_files([make_metadata("report.txt", "original")])
+
+    results = indexer.analyze_files([make_metadata("other.txt", "different")])
+    assert indexer.analyzed == ["report.txt", "other.txt"]
+    assert results[0]["suggested_folder"] == "folder_of_other.txt"
+
+
+def test_analysis_cache_skips_fallback(indexer):
+    """Test that failed analyses are not cached."""
+    metadata = make_metadata("report.txt", "original")
+    indexer.description = FALLBACK_DESCRIPTION
+    indexer.analyze_files([metadata])
+
+    indexer.description = "Quarterly report."
+    results = indexer.analyze_files([metadata])
+    assert indexer.analyzed == ["report.txt", "report.txt"]
+    assert results[0]["description"] == "Quarterly report."
+
+
+def test_analysis_cache_semantic_opt_in(indexer):
+    """Test that similar analyses are only looked up when enabled."""
+    indexer.use_semantic_cache = False
+    indexer.analyze_files([make_metadata("report.txt", "original")])
+    indexer.analyze_files([make_metadata("copy.txt", "similar")])
+
+    assert indexer.embedded == []
+    assert indexer.analyzed == ["report.txt", "copy.txt"]
+
+
+def test_analysis_cache_no_content_exact_only(indexer):
+    """Test that files without content don't reuse similar analyses."""
+    indexer.analyze_files([make_metadata("report.txt", "original")])
+
+    photo = make_metadata("photo.jpg", None)
+    results = indexer.analyze_files([photo])
+    assert indexer.analyzed == ["report.txt", "photo.jpg"]
+    assert results[0]["suggested_folder"] == "folder_of_photo.jpg"
+
+    # Unchanged files without content still reuse their exact match
+    indexer.analyze_files([photo])
+    assert indexer.analyzed == ["report.txt", "photo.jpg"]
+
+
+def test_analysis_cache_scoped_by_model(indexer):
+    """Test that analyses of another model are not reused."""
+    metadata = make_metadata("report.txt", "original")
+    indexer.analyze_files([metadata])
+
+    indexer.config["model_name"] = "other_model"
+    indexer.analyze_files([metadata])
+    assert indexer.analyzed == ["report.txt", "report.txt"]
@@ -0,0 +1,185 @@
+"""Tests for the organizer module."""
+
+import asyncio
+import json
+from types import SimpleNamespace
+
+import llm_organizer.config.defaults as defaults
+import llm_organizer.core.client as client_module
+from llm_organizer.core.organizer import FileOrganizer
+
+
+def schema_response():
+    """Build a chat completion answering with a one-folder schema."""
+    schema = {
+        "folder_hierarchy": [
+            {"name": "Documents", "path": "Documents", "subcategories": []}
+        ],
+        "file_mappings": {},
+    }
+    message = SimpleNamespace(content=json.dumps(schema))
+    return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=None)
+
+
+class FakeCompletions:
+    """Chat completions stub recording how many requests overlap."""
+
+    def __init__(self):
+        self.calls = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.models = set()
+
+    async def create(self, **kwargs):
+        self.calls += 1
+        self.models.add(kwargs["model"])
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.05)
+        self.in_flight -= 1
+        return schema_response()
+
+
+class FakeAsyncClient:
+    """AsyncOpenAI stub sharing one FakeCompletions."""
+
+    def __init__(self, completions):
+        self.chat = SimpleNamespace(completions=completions)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        pass
+
+
+def test_aorganize_many_concurrent(temp_dir, test_config, monkeypatch):
+    """Test that schemas for several directories are requested concurrently."""
+    completions = FakeCompletions()
+    monkeypatch.setattr(
+        client_module,
+        "create_async_openai_client",
+        lambda api_key, **kwargs: FakeAsyncClient(completions),
+    )
+
+    def fail_load_config(*args, **kwargs):
+        raise AssertionError("the organizer's configuration should be used")
+
+    monkeypatch.setattr(defaults, "load_config", fail_load_config)
+
+    test_config.llm.organization_model = "test_organization_model"
+    test_config.organizer.llm_concurrency = 2
+    test_config.organizer.schema_cache_ttl_hours = 0
+
+    result_batches = {}
+    for index in range(5):
+        directory = temp_dir / f"dir{index}"
+        directory.mkdir()
+        file_path = directory / f"notes{index}.txt"
+        file_path.write_text("Meeting notes")
+        result_batches[str(directory)] = [
+            {
+                "path": str(file_path),
+                "tags": ["documents"],
+                "description": "Meeting notes",
+                "category": "Documents",
+                "suggested_folder": "Documents",
+            }
+        ]
+
+    organizer = FileOrganizer(config=test_config)
+    plans = asyncio.run(organizer.aorganize_many(result_batches))
+
+    assert completions.calls == 5
+    assert completions.max_in_flight == 2
+    assert completions.models == {"test_organization_model"}
+
+    assert set(plans) == set(result_batches)
+    for directory, plan in plans.items():
+        assert len(plan["moves"]) == 1
+        assert plan["moves"][0]["destination"].startswith(directory)
+
+
+def test_generate_intelligent_schema_in_event_loop(temp_dir, test_config, monkeypatch):
+    """Test that the synchronous schema request works inside a running loop."""
+    client = SimpleNamespace(
+        chat=SimpleNamespace(
+            completions=SimpleNamespace(create=lambda **kwargs: schema_response())
+        )
+    )
+    monkeypatch.setattr(client_module, "get_openai_client", lambda api_key: client)
+    test_config.organizer.schema_cache_ttl_hours = 0
+
+    file_path = temp_dir / "notes.txt"
+    file_path.write_text("Meeting notes")
+    results = [
+        {
+            "path": str(file_path),
+            "tags": ["documents"],
+            "description": "Meeting notes",
+            "category": "Documents",
+        }
+    ]
+    organizer = FileOrganizer(config=test_config)
+    organizer.base_dir = temp_dir
+
+    async def generate():
+        return organizer.generate_intelligent_schema(results)
+
+    schema = asyncio.run(generate())
+    assert schema["file_mappings"] == {"notes.txt": "Documents"}
+
+
+def test_assign_files_to_folders():
+    """Test the fallback assignment of files by the words they share with folders."""
+    schema = {
+        "folder_hierarchy": [
+            {"name": "Photos", "path": "Photos", "children": []},
+            {
+                "name": "TaxReturns",
+                "path": "TaxReturns",
+                "children": [
+                    {"name": "receipts_2024", "path": "TaxReturns/receipts_2024"}
+                ],
+            },
+            {"name": "Code", "path": "Code", "children": []},
+        ],
+        "file_mappings": {},
+    }
+    files = [
+        {
+            "filename": "beach.heic",
+            "tags": ["photo", "holiday"],
+            "description": "A photo taken at the beach.",
+            "current_path": "beach.heic",
+        },
+        {
+            "filename": "scan_2024.pdf",
+            "tags": ["receipt", "tax"],
+            "description": "A scanned shop receipt.",
+            "current_path": "scan_2024.pdf",
+        },
+        {
+            "filename": "main.py",
+            "tags": ["script"],
+            "description": "Entry point.",
+            "category": "Code",
+            "current_path": "main.py",
+        },
+        {
+            "filename": "barcode.txt",
+            "tags": ["inventory"],
+            "description": "Product numbers.",
+            "current_path": "barcode.txt",
+        },
+    ]
+
+    organizer = FileOrganizer()
+    organizer._assign_files_to_folders(schema, files)
+
+    assert schema["file_mappings"] == {
+        "beach.heic": "Photos",
+        "scan_2024.pdf": "TaxReturns/receipts_2024",
+        "main.py": "Code",
+        "barcode.txt": "other",
+    }
@@ -1,5 +1,9 @@
 """Tests for the scanner module."""
 
+import os
+
+import pytest
+
 from llm_organizer.core.scanner import DirectoryScanner
 
 
@@ -72,3 +76,132 @@ def test_scanner_content_extraction(test_files):
     # Check that content was extracted
     assert txt_file["content"] is not None
     assert "test document" in txt_file["content"].lower()
+
+
+def test_scanner_metadata_cache_exif_image(temp_dir, test_config):
+    """Test that images with EXIF rationals are scanned with the cache enabled."""
+    pytest.importorskip("PIL")
+    from PIL import Image
+
+    test_config.data_dir = str(temp_dir / "data")
+    photos = temp_dir / "photos"
+    photos.mkdir()
+    exif = Image.Exif()
+    exif[282] = 72.0  # XResolution, read back as an IFDRational
+    exif[270] = "Holiday photo"  # ImageDescription
+    Image.new("RGB", (4, 4)).save(photos / "photo.jpg", exif=exif)
+
+    test_config.scanner.use_metadata_cache = True
+
+    # The first scan stores the metadata, the second one reads it back
+    for _ in range(2):
+        scanner = DirectoryScanner(config=test_config)
+        files = scanner.scan_directory(photos)
+        scanner.metadata_cache.close()
+
+        assert len(files) == 1
+        assert files[0]["name"] == "photo.jpg"
+        assert files[0]["content"] == "Holiday photo"
+        assert "XResolution" in files[0]["additional_metadata"]
+
+    assert scanner.metadata_cache.hits == 1
+
+
+@pytest.fixture
+def scanned_dirs(monkeypatch):
+    """Record the directories listed by the scanner's walk."""
+    import llm_organizer.core.scanner as scanner_module
+
+    listed = []
+    scandir = scanner_module.os.scandir
+
+    def recording_scandir(path):
+        listed.append(str(path))
+        return scandir(path)
+
+    monkeypatch.setattr(scanner_module.os, "scandir", recording_scandir)
+    return listed
+
+
+def test_scanner_prunes_common_excludes(test_files, scanned_dirs):
+    """Test that commonly excluded directories are not entered."""
+    for name in ("node_modules", "__pycache__"):
+        excluded = test_files / "nested" / name / "package"
+        excluded.mkdir(parents=True)
+        (excluded / "index.js").write_text("module.exports = {};")
+
+    scanner = DirectoryScanner()
+    files = scanner.scan_directory(test_files, recursive=True)
+
+    names = {file_meta["name"] for file_meta in files}
+    assert "nested_file.txt" in names
+    assert "index.js" not in names
+    assert not any(
+        "node_modules" in path or "__pycache__" in path for path in scanned_dirs
+    )
+
+
+def test_scanner_does_not_follow_symlinked_dirs(test_files, temp_dir):
+    """Test that symlinked directories are not walked."""
+    outside = temp_dir.parent / f"{temp_dir.name}_outside"
+    outside.mkdir()
+    try:
+        (outside / "outside.txt").write_text("Outside the scanned directory.")
+        try:
+            (test_files / "linked").symlink_to(outside, target_is_directory=True)
+        except (OSError, NotImplementedError):
+            pytest.skip("symlinks are not supported")
+
+        scanner = DirectoryScanner()
+        files = scanner.scan_directory(test_files, recursive=True)
+
+        assert "outside.txt" not in {file_meta["name"] for file_meta in files}
+    finally:
+        (outside / "outside.txt").unlink()
+        outside.rmdir()
+
+
+def test_scanner_excludes_organizer_files(test_files, scanned_dirs):
+    """Test that the organizer's own files are hidden from the scan."""
+    from llm_organizer.core.organizer import FileOrganizer
+
+    app_data = test_files / ".llm_organizer"
+    app_data.mkdir()
+    (app_data / "organization_schema_20240101_000000.json").write_text("{}")
+    (test_files / "organization_plan_20240101_000000.html").write_text("<html>")
+    (test_files / "file_organization_toc_20240101_000000.json").write_text("{}")
+
+    organizer = FileOrganizer()
+    organizer.base_dir = test_files
+    scanner = DirectoryScanner(exclude_patterns=organizer.organizer_exclude_patterns())
+    files = scanner.scan_directory(test_files, recursive=True)
+
+    names = {file_meta["name"] for file_meta in files}
+    assert "document.txt" in names
+    assert not any(
+        name.startswith(("organization_", "file_organization")) for name in names
+    )
+    assert str(app_data) not in scanned_dirs
+
+
+def test_scanner_metadata_cache_relative_path(test_files, test_config, monkeypatch):
+    """Test that cached metadata carries the path the file was scanned through."""
+    test_config.data_dir = str(test_files / "data")
+    test_config.scanner.use_metadata_cache = True
+
+    # Scan through a relative path first, then through the absolute path
+    monkeypatch.chdir(test_files)
+    scanner = DirectoryScanner(config=test_config)
+    relative = scanner.scan_directory("nested")
+    scanner.metadata_cache.close()
+    assert relative[0]["path"] == os.path.join("nested", "nested_file.txt")
+
+    monkeypatch.chdir(test_files.parent)
+    scanner = DirectoryScanner(config=test_config)
+    absolute = scanner.scan_directory(str(test_files / "nested"))
+    scanner.metadata_cache.close()
+
+    assert scanner.metadata_cache.hits == 1
+    assert absolute[0]["path"] == str(test_files / "nested" / "nested_file.txt")
+    assert absolute[0]["name"] == "nested_file.txt"
+    assert os.path.exists(absolute[0]["path"])
@@ -0,0 +1,88 @@
+"""Tests for the analysis cache."""
+
+import pytest
+
+from llm_organizer.models.analysis_cache import AnalysisCache
+
+
+def make_analysis(folder):
+    """Build an analysis result."""
+    return {"tags": ["tag"], "suggested_folder": folder, "description": "A file."}
+
+
+def test_analysis_cache_put_many_reloads_embeddings(temp_dir):
+    """Test that stored embeddings are used by the next similarity lookup."""
+    pytest.importorskip("numpy")
+    cache = AnalysisCache(str(temp_dir / "analysis.sqlite"), similarity_threshold=0.9)
+
+    cache.put_many([("first", make_analysis("first_folder"), [1.0, 0.0])])
+    assert cache.find_similar([1.0, 0.1])["suggested_folder"] == "first_folder"
+    assert cache.find_similar([0.0, 1.0]) is None
+
+    # The loaded matrix must be refreshed with the new embedding
+    cache.put_many(
+        [
+            ("second", make_analysis("second_folder"), [0.0, 1.0]),
+            ("third", make_analysis("third_folder"), None),
+        ]
+    )
+    assert cache.find_similar([0.1, 1.0])["suggested_folder"] == "second_folder"
+    assert cache.get("third")["suggested_folder"] == "third_folder"
+    cache.close()
+
+    # A new cache instance loads the stored embeddings from the database
+    cache = AnalysisCache(str(temp_dir / "analysis.sqlite"), similarity_threshold=0.9)
+    assert cache.find_similar([0.0, 1.0])["suggested_folder"] == "second_folder"
+    cache.close()
+
+
+def test_analysis_cache_embedding_dimensions(temp_dir):
+    """Test that only embeddings of the query's size are compared."""
+    pytest.importorskip("numpy")
+    cache = AnalysisCache(str(temp_dir / "analysis.sqlite"), similarity_threshold=0.9)
+    cache.put_many(
+        [
+            ("small", make_analysis("small_folder"), [1.0, 0.0]),
+            ("large", make_analysis("large_folder"), [1.0, 0.0, 0.0]),
+        ]
+    )
+
+    assert cache.find_similar([1.0, 0.0])["suggested_folder"] == "small_folder"
+    assert cache.find_similar([1.0, 0.0, 0.0])["suggested_folder"] == "large_folder"
+    assert cache.find_similar([1.0, 0.0, 0.0, 0.0]) is None
+    cache.close()
+
+
+def test_analysis_cache_scopes(temp_dir):
+    """Test that entries are only reused within their scope."""
+    pytest.importorskip("numpy")
+    db_path = str(temp_dir / "analysis.sqlite")
+    cache = AnalysisCache(db_path, similarity_threshold=0.9, scope="model-a")
+    key = cache.content_key("document")
+    cache.put(key, make_analysis("folder_a"), [1.0, 0.0])
+    cache.close()
+
+    other = AnalysisCache(db_path, similarity_threshold=0.9, scope="model-b")
+    assert other.content_key("document") != key
+    assert other.get(other.content_key("document")) is None
+    assert other.find_similar([1.0, 0.0]) is None
+    other.close()
+
+
+def test_analysis_cache_adds_scope_column(temp_dir):
+    """Test opening a cache created before entries had a scope."""
+    import sqlite3
+
+    db_path = str(temp_dir / "analysis.sqlite")
+    conn = sqlite3.connect(db_path)
+    conn.execute(
+        "CREATE TABLE analysis_cache (key TEXT PRIMARY KEY, tags TEXT, "
+        "suggested_folder TEXT, description TEXT, embedding BLOB)"
+    )
+    conn.commit()
+    conn.close()
+
+    cache = AnalysisCache(db_path)
+    cache.put("key", make_analysis("folder"))
+    assert cache.get("key")["suggested_folder"] == "folder"
+    cache.close()
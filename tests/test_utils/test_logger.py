@@ -0,0 +1,78 @@
+"""Tests for the operation logger."""
+
+import json
+
+import pytest
+
+from llm_organizer.core.organizer import FileOrganizer
+from llm_organizer.utils.logger import OperationLogger
+
+
+@pytest.fixture
+def logger(temp_dir, monkeypatch):
+    """Create a logger writing to a temporary home directory."""
+    monkeypatch.setenv("HOME", str(temp_dir / "home"))
+    return OperationLogger()
+
+
+def test_log_operations_from_generator(logger):
+    """Test that operations logged from a generator are read back in order."""
+    operations = [
+        {"type": "create_folder", "path": "/data/docs"},
+        {"type": "move", "source": "/data/a.txt", "destination": "/data/docs/a.txt"},
+    ]
+
+    assert logger.log_operations(op for op in operations) == 2
+    assert logger.get_last_operations() == operations
+
+
+def test_get_last_operations_skips_truncated_line(logger):
+    """Test that a line cut short by an interrupted run is skipped."""
+    operation = {"type": "create_folder", "path": "/data/docs"}
+    logger.log_operations([operation])
+
+    latest_log = logger._latest_log_file()
+    with open(latest_log, "a", encoding="utf-8") as f:
+        f.write('{"type": "move", "source": "/data/a.t')
+
+    assert logger.get_last_operations() == [operation]
+
+
+def test_get_last_operations_legacy_json(logger):
+    """Test reading a log written as a single JSON document."""
+    operations = [{"type": "create_folder", "path": "/data/docs"}]
+    legacy_log = logger.log_dir / "operations_20240101_000000.json"
+    legacy_log.write_text(
+        json.dumps({"timestamp": "2024-01-01T00:00:00", "operations": operations})
+    )
+
+    assert logger.get_last_operations() == operations
+
+
+def test_undo_operations(logger, temp_dir):
+    """Test that undo moves files back and removes the created folders."""
+    base_dir = temp_dir / "files"
+    base_dir.mkdir()
+    (base_dir / "a.txt").write_text("a")
+    (base_dir / "b.txt").write_text("b")
+    docs = base_dir / "docs"
+    reports = docs / "reports"
+    plan = {
+        "folders": {str(docs): None, str(reports): None},
+        "moves": [
+            {"source": str(base_dir / "a.txt"), "destination": str(docs / "a.txt")},
+            {"source": str(base_dir / "b.txt"), "destination": str(reports / "b.txt")},
+        ],
+        "toc_entries": [],
+    }
+
+    organizer = FileOrganizer()
+    organizer.base_dir = base_dir
+    assert logger.log_operations(organizer.iter_execute_plan(plan)) == 4
+    assert (reports / "b.txt").exists()
+
+    logger.undo_operations(logger.get_last_operations())
+
+    assert (base_dir / "a.txt").read_text() == "a"
+    assert (base_dir / "b.txt").read_text() == "b"
+    assert not docs.exists()